@@ -0,0 +1,81 @@
+"""Add menu positions_count maintained by trigger
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:12:40.381204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "menu",
+        sa.Column("positions_count", sa.Integer, nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        UPDATE menu
+        SET positions_count = (
+            SELECT count(*) FROM menu_menu_position
+            WHERE menu_menu_position.menu_id = menu.id
+        )
+        """
+    )
+    op.create_index("ix_menu_positions_count_id", "menu", ["positions_count", "id"])
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION update_menu_positions_count() RETURNS trigger AS $$
+        BEGIN
+            UPDATE menu
+            SET positions_count = menu.positions_count
+                + CASE WHEN TG_OP = 'INSERT' THEN changed.count ELSE -changed.count END
+            FROM (
+                SELECT menu_id, count(*) AS count FROM changed_rows GROUP BY menu_id
+            ) AS changed
+            WHERE menu.id = changed.menu_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER menu_positions_count_insert
+        AFTER INSERT ON menu_menu_position
+        REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION update_menu_positions_count()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER menu_positions_count_delete
+        AFTER DELETE ON menu_menu_position
+        REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION update_menu_positions_count()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS menu_positions_count_delete ON menu_menu_position"
+    )
+    op.execute(
+        "DROP TRIGGER IF EXISTS menu_positions_count_insert ON menu_menu_position"
+    )
+    op.execute("DROP FUNCTION IF EXISTS update_menu_positions_count()")
+    op.drop_index("ix_menu_positions_count_id", table_name="menu")
+    op.drop_column("menu", "positions_count")
@@ -0,0 +1,52 @@
+"""Add full-text search vector on menu position
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:20:45.108337
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "menu_position",
+        sa.Column(
+            "search_vector",
+            TSVECTOR,
+            sa.Computed(
+                "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        ),
+    )
+    op.create_index(
+        "ix_menu_position_search_vector",
+        "menu_position",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index("ix_menu_position_price", "menu_position", ["price"])
+    op.create_index(
+        "ix_menu_position_preparation_time", "menu_position", ["preparation_time"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_menu_position_preparation_time", table_name="menu_position")
+    op.drop_index("ix_menu_position_price", table_name="menu_position")
+    op.drop_index("ix_menu_position_search_vector", table_name="menu_position")
+    op.drop_column("menu_position", "search_vector")
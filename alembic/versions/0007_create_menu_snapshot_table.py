@@ -0,0 +1,38 @@
+"""Create menu snapshot table
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 15:41:03.287116
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "menu_snapshot",
+        sa.Column(
+            "menu_id",
+            sa.Integer,
+            sa.ForeignKey("menu.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("body", sa.LargeBinary, nullable=False),
+        sa.Column("etag", sa.String(66), nullable=False),
+        sa.Column("last_modified", sa.String(64), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("menu_snapshot")
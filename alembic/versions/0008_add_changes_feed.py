@@ -0,0 +1,39 @@
+"""Add updated_at indexes and tombstone table for changes feed
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 17:05:52.640183
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_menu_updated_at", "menu", ["updated_at"])
+    op.create_index("ix_menu_position_updated_at", "menu_position", ["updated_at"])
+    op.create_table(
+        "tombstone",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("table_name", sa.String(64), nullable=False),
+        sa.Column("row_id", sa.Integer, nullable=False),
+        sa.Column("deleted_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_tombstone_deleted_at", "tombstone", ["deleted_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tombstone_deleted_at", table_name="tombstone")
+    op.drop_table("tombstone")
+    op.drop_index("ix_menu_position_updated_at", table_name="menu_position")
+    op.drop_index("ix_menu_updated_at", table_name="menu")
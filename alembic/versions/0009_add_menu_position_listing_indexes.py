@@ -0,0 +1,39 @@
+"""Add composite indexes for menu position listing
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 18:21:07.512930
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_menu_position_name_id", "menu_position", ["name", "id"])
+    op.create_index("ix_menu_position_price_id", "menu_position", ["price", "id"])
+    op.create_index(
+        "ix_menu_position_preparation_time_id",
+        "menu_position",
+        ["preparation_time", "id"],
+    )
+    op.drop_index("ix_menu_position_price", table_name="menu_position")
+    op.drop_index("ix_menu_position_preparation_time", table_name="menu_position")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_menu_position_preparation_time", "menu_position", ["preparation_time"]
+    )
+    op.create_index("ix_menu_position_price", "menu_position", ["price"])
+    op.drop_index("ix_menu_position_preparation_time_id", table_name="menu_position")
+    op.drop_index("ix_menu_position_price_id", table_name="menu_position")
+    op.drop_index("ix_menu_position_name_id", table_name="menu_position")
@@ -0,0 +1,31 @@
+"""Add menu_menu_position index on menu_position_id
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 19:02:44.180317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_menu_menu_position_menu_position_id",
+        "menu_menu_position",
+        ["menu_position_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_menu_menu_position_menu_position_id", table_name="menu_menu_position"
+    )
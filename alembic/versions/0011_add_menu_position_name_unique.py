@@ -0,0 +1,55 @@
+"""Add unique constraint on menu_position name
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 21:40:12.518730
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE renamed_menu_position ON COMMIT DROP AS
+        SELECT id, ' (' || id || ')' AS suffix
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY name ORDER BY id) AS rank
+            FROM menu_position
+        ) AS ranked
+        WHERE rank > 1
+        """
+    )
+    op.execute(
+        """
+        UPDATE menu_position
+        SET name = left(menu_position.name, 255 - length(renamed.suffix))
+                || renamed.suffix,
+            updated_at = now()
+        FROM renamed_menu_position AS renamed
+        WHERE menu_position.id = renamed.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM menu_snapshot
+        WHERE menu_id IN (
+            SELECT menu_id FROM menu_menu_position
+            WHERE menu_position_id IN (SELECT id FROM renamed_menu_position)
+        )
+        """
+    )
+    op.create_unique_constraint("uq_menu_position_name", "menu_position", ["name"])
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_menu_position_name", "menu_position", type_="unique")
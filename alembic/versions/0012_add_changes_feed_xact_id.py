@@ -0,0 +1,69 @@
+"""Track writing transaction id for changes feed
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 22:18:36.904115
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["menu", "menu_position", "tombstone"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "xact_id",
+                sa.BigInteger,
+                nullable=False,
+                server_default=sa.text("pg_current_xact_id()::text::bigint"),
+            ),
+        )
+        op.create_index(f"ix_{table}_xact_id", table, ["xact_id"])
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_xact_id() RETURNS trigger AS $$
+        BEGIN
+            NEW.xact_id := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER menu_xact_id
+        BEFORE UPDATE ON menu
+        FOR EACH ROW EXECUTE FUNCTION set_xact_id()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER menu_position_xact_id
+        BEFORE UPDATE ON menu_position
+        FOR EACH ROW EXECUTE FUNCTION set_xact_id()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS menu_position_xact_id ON menu_position")
+    op.execute("DROP TRIGGER IF EXISTS menu_xact_id ON menu")
+    op.execute("DROP FUNCTION IF EXISTS set_xact_id()")
+    for table in reversed(TABLES):
+        op.drop_index(f"ix_{table}_xact_id", table_name=table)
+        op.drop_column(table, "xact_id")
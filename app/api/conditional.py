@@ -0,0 +1,42 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http import HTTPStatus
+from typing import Any, Optional
+
+from fastapi import Response
+
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+CACHE_CONTROL_HEADER = "Cache-Control"
+AGE_HEADER = "Age"
+
+
+def make_etag(*parts: Any) -> str:
+    return '"' + hashlib.sha256(repr(parts).encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def get_conditional_headers(
+    etag: str, last_modified: Optional[datetime]
+) -> dict[str, str]:
+    headers = {ETAG_HEADER: etag}
+    if last_modified is not None:
+        headers[LAST_MODIFIED_HEADER] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
@@ -1,9 +1,10 @@
 import base64
-from typing import Iterator
+from typing import AsyncIterator, Iterator
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_session
+from app.db import get_async_session_constructor, get_session
 from app.settings import settings
 
 
@@ -16,3 +17,11 @@ def get_db():
             db.close()
 
     return inner
+
+
+def get_async_db():
+    async def inner() -> AsyncIterator[AsyncSession]:
+        async with get_async_session_constructor(settings.database)() as db:
+            yield db
+
+    return inner
@@ -0,0 +1,26 @@
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+from app.settings import settings
+from app.utils.broadcast import Broadcaster
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+SUBSCRIBED = b": subscribed\n\n"
+KEEPALIVE = b": keepalive\n\n"
+
+
+async def stream_events(broadcaster: Broadcaster) -> AsyncIterator[bytes]:
+    with broadcaster.subscribe() as subscription:
+        yield SUBSCRIBED
+        while True:
+            message = await subscription.get(settings.menu_stream_keepalive)
+            yield KEEPALIVE if message is None else message
+
+
+def event_stream_response(broadcaster: Broadcaster) -> StreamingResponse:
+    return StreamingResponse(
+        stream_events(broadcaster),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
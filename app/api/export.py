@@ -0,0 +1,38 @@
+from typing import AsyncIterator, Callable
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app.api.serialization import dump_menu, dump_menu_position
+from app.api.utils import LOAD_MENU_POSITIONS
+from app.db import Base, get_async_session_constructor
+from app.models.menu import Menu, MenuPosition
+from app.settings import settings
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EXPORT_BATCH_SIZE = 1000
+
+
+async def stream_rows(
+    statement: Select, dump: Callable[[Base], bytes]
+) -> AsyncIterator[bytes]:
+    async with get_async_session_constructor(settings.database)() as db:
+        result = await db.stream_scalars(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield b"".join(dump(row) + b"\n" for row in rows)
+
+
+def stream_menus() -> AsyncIterator[bytes]:
+    statement = select(Menu).options(LOAD_MENU_POSITIONS).order_by(Menu.id)
+    return stream_rows(statement, dump_menu)
+
+
+def stream_menu_positions() -> AsyncIterator[bytes]:
+    statement = select(MenuPosition).order_by(MenuPosition.id)
+    return stream_rows(statement, dump_menu_position)
+
+
+def ndjson_response(content: AsyncIterator[bytes]) -> StreamingResponse:
+    return StreamingResponse(content, media_type=NDJSON_MEDIA_TYPE)
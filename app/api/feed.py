@@ -0,0 +1,54 @@
+import base64
+import binascii
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import Column, ColumnElement, and_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_XACT_ID = 2**63 - 1
+
+SELECT_WATERMARK = text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+def encode_watermark(watermark: int) -> str:
+    return base64.urlsafe_b64encode(str(watermark).encode()).decode()
+
+
+def decode_watermark(since: str) -> datetime | int:
+    try:
+        return to_naive_utc(datetime.fromisoformat(since))
+    except ValueError:
+        pass
+
+    try:
+        decoded = base64.urlsafe_b64decode(since).decode()
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
+    if decoded.isascii() and decoded.isdigit():
+        if int(decoded) > MAX_XACT_ID:
+            raise HTTPException(status_code=400, detail="Invalid watermark")
+        return int(decoded)
+    try:
+        return to_naive_utc(datetime.fromisoformat(decoded))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid watermark")
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def changed_between(
+    changed_at: Column, xact_id: Column, since: datetime | int, watermark: int
+) -> ColumnElement[bool]:
+    if isinstance(since, int):
+        return and_(xact_id >= since, xact_id < watermark)
+    return and_(changed_at >= since, xact_id < watermark)
+
+
+async def get_watermark(db: AsyncSession) -> int:
+    return await db.scalar(SELECT_WATERMARK)
@@ -1,101 +1,484 @@
+import asyncio
 from http import HTTPStatus
-from typing import List
+from typing import Awaitable, Callable, Hashable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db
+from app.api.conditional import (
+    AGE_HEADER,
+    CACHE_CONTROL_HEADER,
+    ETAG_HEADER,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
+from app.api.deps import get_async_db
+from app.api.events import event_stream_response
+from app.api.export import ndjson_response, stream_menus
+from app.api.feed import (
+    changed_between,
+    decode_watermark,
+    encode_watermark,
+    get_watermark,
+)
+from app.api.pagination import NEXT_CURSOR_HEADER, get_next_cursor, paginate
+from app.api.serialization import (
+    MenuFieldset,
+    MenusVersion,
+    dump_menus,
+    dump_sparse_menu,
+    dump_sparse_menus,
+    get_fieldset_headers,
+    get_menu_fieldset_options,
+    get_menus_version,
+    get_sparse_version_headers,
+    get_version_headers,
+    parse_menu_fieldset,
+)
+from app.api.snapshot import get_menu_snapshots, store_menu_snapshots
 from app.api.utils import (
+    LOAD_MENU_POSITIONS,
     add_row_to_table,
+    add_tombstone,
+    attach_menu_positions,
+    detach_menu_positions,
+    escape_like,
     get_menu_and_position,
+    get_row_by_id,
+    is_row_id,
     menu_contains_position,
+    replace_menu_positions,
     update_table,
 )
-from app.models.menu import Menu, MenuPosition
+from app.db import get_async_session_constructor
+from app.models.menu import Menu, MenuMenuPosition, MenuPosition, Tombstone
 from app.schemas.menu import (
+    MenuBatchQuerySchema,
+    MenuChangesQuerySchema,
+    MenuChangesSchema,
     MenuCreateSchema,
+    MenuFieldsQuerySchema,
     MenuPatchSchema,
+    MenuPositionIdsSchema,
+    MenuPositionLinksResultSchema,
+    MenuPositionLinksSchema,
     MenuSchema,
     MenusQuerySchema,
     MenuUpdateSchema,
+    SortParameter,
 )
+from app.settings import settings
+from app.utils.broadcast import menu_broadcaster
+from app.utils.cache import MENUS_TAG, CachedResponse, menu_cache, menu_loads, menu_tag
+from app.utils.changes import ATTACHED, CREATED, DELETED, DETACHED, record_change
 from app.utils.enums import UpdateMethod
 
 admin = APIRouter(dependencies=[Depends(OAuth2PasswordBearer(tokenUrl="token"))])
 public = APIRouter()
 
+MENU_BATCH_MAX_SIZE = 50
+
+MENU_SORT_KEYS = {
+    SortParameter.NAME: [Menu.name, Menu.id],
+    SortParameter.POSITIONS_COUNT: [Menu.positions_count, Menu.id],
+}
+
+
+def select_menus_version(page: Select) -> Select:
+    page = page.cte("page")
+    links = (
+        select(
+            MenuMenuPosition.c.menu_id,
+            MenuMenuPosition.c.menu_position_id,
+            MenuPosition.updated_at,
+        )
+        .join(MenuPosition, MenuPosition.id == MenuMenuPosition.c.menu_position_id)
+        .where(MenuMenuPosition.c.menu_id.in_(select(page.c.id)))
+        .cte("links")
+    )
+    links_order = [links.c.menu_id, links.c.menu_position_id]
+    return select(
+        select(
+            func.array_agg(aggregate_order_by(page.c.id, page.c.position))
+        ).scalar_subquery(),
+        select(func.max(page.c.updated_at)).scalar_subquery(),
+        select(
+            func.array_agg(aggregate_order_by(links.c.menu_id, *links_order))
+        ).scalar_subquery(),
+        select(
+            func.array_agg(aggregate_order_by(links.c.menu_position_id, *links_order))
+        ).scalar_subquery(),
+        select(func.max(links.c.updated_at)).scalar_subquery(),
+    )
+
+
+async def get_stored_menus_version(db: AsyncSession, page: Select) -> MenusVersion:
+    ids, updated_at, link_menus, link_positions, positions_updated_at = (
+        await db.execute(select_menus_version(page))
+    ).one()
+    return (
+        ids or [],
+        updated_at,
+        list(zip(link_menus or [], link_positions or [])),
+        positions_updated_at,
+    )
+
+
+def select_menus_page_version(page: Select) -> Select:
+    page = page.cte("page")
+    return select(
+        func.array_agg(aggregate_order_by(page.c.id, page.c.position)),
+        func.max(page.c.updated_at),
+    )
+
+
+async def get_stored_menus_headers(
+    db: AsyncSession, page: Select, fieldset: Optional[MenuFieldset]
+) -> dict[str, str]:
+    if fieldset is None:
+        return get_version_headers(await get_stored_menus_version(db, page))
+
+    if fieldset.position_fields is None:
+        ids, updated_at = (await db.execute(select_menus_page_version(page))).one()
+        return get_fieldset_headers(fieldset, ids or [], updated_at, [])
+
+    ids, updated_at, links, _ = await get_stored_menus_version(db, page)
+    return get_fieldset_headers(fieldset, ids, updated_at, links)
+
+
+def get_menu_key(menu_id: int, fieldset: Optional[MenuFieldset]) -> Hashable:
+    key = menu_tag(menu_id)
+    return key if fieldset is None else (key, fieldset)
+
+
+async def load_menus(
+    db: AsyncSession, menu_ids: list[int]
+) -> dict[int, CachedResponse]:
+    loaded = await get_menu_snapshots(db, menu_ids)
+    missing = [
+        menu_id for menu_id in menu_ids if menu_id not in loaded and is_row_id(menu_id)
+    ]
+    if missing:
+        menus = await db.scalars(
+            select(Menu).options(LOAD_MENU_POSITIONS).where(Menu.id.in_(missing))
+        )
+        loaded.update(await store_menu_snapshots(db, menus.all()))
+    return loaded
+
+
+async def load_sparse_menus(
+    db: AsyncSession, menu_ids: list[int], fieldset: MenuFieldset
+) -> dict[int, CachedResponse]:
+    menu_ids = [menu_id for menu_id in menu_ids if is_row_id(menu_id)]
+    if not menu_ids:
+        return {}
+
+    menus = await db.scalars(
+        select(Menu)
+        .options(*get_menu_fieldset_options(fieldset))
+        .where(Menu.id.in_(menu_ids))
+    )
+    return {
+        menu.id: CachedResponse(
+            dump_sparse_menu(menu, fieldset),
+            get_sparse_version_headers([menu], fieldset),
+        )
+        for menu in menus
+    }
+
+
+def parse_menu_ids(ids: str) -> list[int]:
+    parts = [part.strip() for part in ids.split(",")]
+    if not all(part.isdecimal() for part in parts):
+        raise HTTPException(status_code=400, detail="Invalid menu ids")
+
+    menu_ids = list(dict.fromkeys(int(part) for part in parts))
+    if len(menu_ids) > MENU_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MENU_BATCH_MAX_SIZE} menu ids can be requested",
+        )
+    return menu_ids
+
+
+def build_menus_batch(
+    menu_ids: list[int], found: dict[int, CachedResponse]
+) -> CachedResponse:
+    entries = [found.get(menu_id) for menu_id in menu_ids]
+    body = b",".join(
+        b'"%d":%s' % (menu_id, b"null" if entry is None else entry.body)
+        for menu_id, entry in zip(menu_ids, entries)
+    )
+    etag = make_etag(*(entry and entry.headers[ETAG_HEADER] for entry in entries))
+    return CachedResponse(b"{" + body + b"}", {ETAG_HEADER: etag})
+
+
+async def run_menu_load(
+    key: Hashable, load: Callable[[], Awaitable[CachedResponse]]
+) -> CachedResponse:
+    try:
+        return await menu_loads.run(key, load)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE, detail="Loading menu timed out"
+        )
+
+
+def get_menus_cache_control() -> str:
+    return (
+        f"max-age={int(menu_cache.ttl)}, "
+        f"stale-while-revalidate={int(menu_cache.stale_ttl)}"
+    )
+
+
+def get_conditional_response(cached: CachedResponse, request: Request) -> Response:
+    if etag_matches(request.headers.get("If-None-Match"), cached.headers[ETAG_HEADER]):
+        return not_modified(cached.headers)
+    return cached.to_response()
+
 
 @public.get("/", response_model=List[MenuSchema])
 async def get_menus(
-    query: MenusQuerySchema = Depends(), db: Session = Depends(get_db())
+    request: Request,
+    query: MenusQuerySchema = Depends(),
+    db: AsyncSession = Depends(get_async_db()),
 ):
-    results = db.query(Menu).order_by(query.sortby)
+    fieldset = parse_menu_fieldset(query.fields, query.include)
+    key = (MENUS_TAG, query.model_dump_json())
+    hit = menu_cache.get_hit(key)
+    if hit is not None:
+        if hit.stale:
+            menu_loads.refresh(key, lambda: load_menus_page(key, query, fieldset))
+        response = get_conditional_response(hit.value, request)
+        response.headers[AGE_HEADER] = str(int(hit.age))
+        return response
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        page = select_menus(query).with_only_columns(
+            Menu.id,
+            Menu.updated_at,
+            func.row_number()
+            .over(order_by=MENU_SORT_KEYS[query.sortby])
+            .label("position"),
+        )
+        headers = await get_stored_menus_headers(db, page, fieldset)
+        headers[CACHE_CONTROL_HEADER] = get_menus_cache_control()
+        if etag_matches(if_none_match, headers[ETAG_HEADER]):
+            return not_modified(headers)
+
+    cached = await run_menu_load(key, lambda: load_menus_page(key, query, fieldset))
+    return get_conditional_response(cached, request)
+
+
+async def load_menus_page(
+    key: Hashable, query: MenusQuerySchema, fieldset: Optional[MenuFieldset]
+) -> CachedResponse:
+    generation = menu_cache.generation
+    keys = MENU_SORT_KEYS[query.sortby]
+    if fieldset is None:
+        options = [LOAD_MENU_POSITIONS]
+    else:
+        options = get_menu_fieldset_options(fieldset, *keys)
+
+    async with get_async_session_constructor(settings.database)() as db:
+        menus = (await db.scalars(select_menus(query).options(*options))).all()
+
+    if fieldset is None:
+        cached = CachedResponse(
+            dump_menus(menus), get_version_headers(get_menus_version(menus))
+        )
+    else:
+        cached = CachedResponse(
+            dump_sparse_menus(menus, fieldset),
+            get_sparse_version_headers(menus, fieldset),
+        )
+    cached.headers[CACHE_CONTROL_HEADER] = get_menus_cache_control()
+    next_cursor = get_next_cursor(menus, query.sortby.value, keys, query.limit)
+    if next_cursor is not None:
+        cached.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    menu_cache.set(key, cached, generation, tags=[MENUS_TAG])
+    return cached
+
+
+def select_menus(query: MenusQuerySchema) -> Select:
+    results = select(Menu)
     if query.name:
-        results = results.filter(func.lower(Menu.name).like(f"%{query.name.lower()}%"))
+        results = results.where(
+            Menu.name.ilike(f"%{escape_like(query.name)}%", escape="\\")
+        )
 
     if query.created_before:
-        results = results.filter(Menu.created_at <= query.created_before)
+        results = results.where(Menu.created_at <= query.created_before)
 
     if query.created_after:
-        results = results.filter(Menu.created_at >= query.created_after)
+        results = results.where(Menu.created_at >= query.created_after)
 
     if query.updated_before:
-        results = results.filter(Menu.updated_at <= query.updated_before)
+        results = results.where(Menu.updated_at <= query.updated_before)
 
     if query.updated_after:
-        results = results.filter(Menu.updated_at >= query.updated_after)
+        results = results.where(Menu.updated_at >= query.updated_after)
 
-    return results.order_by(query.sortby).all()
+    keys = MENU_SORT_KEYS[query.sortby]
+    return paginate(results, query.sortby.value, keys, query.cursor, query.limit)
+
+
+@public.get("/changes", response_model=MenuChangesSchema)
+async def get_menu_changes(
+    query: MenuChangesQuerySchema = Depends(),
+    db: AsyncSession = Depends(get_async_db()),
+):
+    since = decode_watermark(query.since)
+    watermark = await get_watermark(db)
+
+    menus = await db.scalars(
+        select(Menu)
+        .options(LOAD_MENU_POSITIONS)
+        .where(changed_between(Menu.updated_at, Menu.xact_id, since, watermark))
+        .order_by(Menu.updated_at, Menu.id)
+    )
+    positions = await db.scalars(
+        select(MenuPosition)
+        .where(
+            changed_between(
+                MenuPosition.updated_at, MenuPosition.xact_id, since, watermark
+            )
+        )
+        .order_by(MenuPosition.updated_at, MenuPosition.id)
+    )
+    tombstones = await db.execute(
+        select(Tombstone.table_name, Tombstone.row_id)
+        .where(
+            changed_between(Tombstone.deleted_at, Tombstone.xact_id, since, watermark)
+        )
+        .order_by(Tombstone.id)
+    )
+
+    deleted = {Menu.__tablename__: [], MenuPosition.__tablename__: []}
+    for table_name, row_id in tombstones:
+        deleted[table_name].append(row_id)
+
+    return {
+        "menus": menus.all(),
+        "positions": positions.all(),
+        "deleted_menus": deleted[Menu.__tablename__],
+        "deleted_positions": deleted[MenuPosition.__tablename__],
+        "watermark": encode_watermark(watermark),
+    }
+
+
+@public.get("/batch", response_model=dict[int, Optional[MenuSchema]])
+async def get_menus_batch(
+    request: Request,
+    query: MenuBatchQuerySchema = Depends(),
+    db: AsyncSession = Depends(get_async_db()),
+):
+    menu_ids = parse_menu_ids(query.ids)
+    fieldset = parse_menu_fieldset(query.fields, query.include)
+    found = {}
+    for menu_id in menu_ids:
+        cached = menu_cache.get(get_menu_key(menu_id, fieldset))
+        if cached is not None:
+            found[menu_id] = cached
+
+    generation = menu_cache.generation
+    remaining = [menu_id for menu_id in menu_ids if menu_id not in found]
+    if fieldset is None:
+        loaded = await load_menus(db, remaining)
+    else:
+        loaded = await load_sparse_menus(db, remaining, fieldset)
+
+    for menu_id, cached in loaded.items():
+        key = get_menu_key(menu_id, fieldset)
+        menu_cache.set(key, cached, generation, tags=[menu_tag(menu_id)])
+    found.update(loaded)
+    return get_conditional_response(build_menus_batch(menu_ids, found), request)
+
+
+@public.get("/stream", response_class=StreamingResponse)
+async def stream_menu_changes():
+    return event_stream_response(menu_broadcaster)
 
 
 @public.get("/{menu_id}", response_model=MenuSchema)
-async def get_menu(menu_id: int, db: Session = Depends(get_db())):
-    menu = db.get(Menu, menu_id)
-    if menu is None:
+async def get_menu(
+    menu_id: int,
+    request: Request,
+    query: MenuFieldsQuerySchema = Depends(),
+):
+    fieldset = parse_menu_fieldset(query.fields, query.include)
+    key = get_menu_key(menu_id, fieldset)
+    cached = menu_cache.get(key)
+    if cached is None:
+        cached = await run_menu_load(key, lambda: load_menu(key, menu_id, fieldset))
+    return get_conditional_response(cached, request)
+
+
+async def load_menu(
+    key: Hashable, menu_id: int, fieldset: Optional[MenuFieldset]
+) -> CachedResponse:
+    generation = menu_cache.generation
+    async with get_async_session_constructor(settings.database)() as db:
+        if fieldset is None:
+            loaded = await load_menus(db, [menu_id])
+        else:
+            loaded = await load_sparse_menus(db, [menu_id], fieldset)
+
+    cached = loaded.get(menu_id)
+    if cached is None:
         raise HTTPException(status_code=404, detail="Menu not found")
 
-    return menu
+    menu_cache.set(key, cached, generation, tags=[menu_tag(menu_id)])
+    return cached
+
+
+@admin.get("/export", response_class=StreamingResponse)
+async def export_menus():
+    return ndjson_response(stream_menus())
 
 
 @admin.post("/", response_model=MenuSchema, status_code=HTTPStatus.CREATED)
-async def create_menu(menu: MenuCreateSchema, db: Session = Depends(get_db())):
+async def create_menu(
+    menu: MenuCreateSchema, db: AsyncSession = Depends(get_async_db())
+):
     if menu.positions is not None:
+        position_ids = [i for i in menu.positions if is_row_id(i)]
         positions = (
-            db.query(MenuPosition).filter(MenuPosition.id.in_(menu.positions)).all()
-        )
+            await db.scalars(
+                select(MenuPosition).where(MenuPosition.id.in_(position_ids))
+            )
+        ).all()
     else:
         positions = []
 
-    return add_row_to_table(db, Menu(name=menu.name, positions=positions))
+    new_menu = Menu(name=menu.name, positions=positions)
+    record_change(db, menus=[new_menu], kind=CREATED)
+    return await add_row_to_table(db, new_menu)
 
 
 @admin.patch("/{menu_id}", response_model=MenuSchema)
 async def patch_menu(
     menu_id: int,
     menu_update: MenuPatchSchema,
-    db: Session = Depends(get_db()),
+    db: AsyncSession = Depends(get_async_db()),
 ):
     if menu_update.positions is not None:
-        positions = (
-            db.query(MenuPosition)
-            .filter(MenuPosition.id.in_(menu_update.positions))
-            .all()
-        )
-    else:
-        positions = None
-    model = MenuUpdateSchema(
-        name=menu_update.name,
-        positions=positions,
-    )
-    return update_table(
+        await replace_menu_positions(db, menu_id, menu_update.positions)
+    record_change(db, menus=[menu_id])
+    return await update_table(
         db=db,
         row_identifier=menu_id,
-        update_model=model,
+        update_model=menu_update,
         schema=Menu,
-        return_schema=MenuSchema,
         method=UpdateMethod.PATCH,
+        options=[LOAD_MENU_POSITIONS],
     )
 
 
@@ -103,66 +486,134 @@ async def patch_menu(
 async def update_menu(
     menu_id: int,
     menu_update: MenuUpdateSchema,
-    db: Session = Depends(get_db()),
+    db: AsyncSession = Depends(get_async_db()),
 ):
-    model = MenuPatchSchema(
-        name=menu_update.name,
-        positions=db.query(MenuPosition)
-        .filter(MenuPosition.id.in_(menu_update.positions))
-        .all(),
-    )
-    return update_table(
+    await replace_menu_positions(db, menu_id, menu_update.positions)
+    record_change(db, menus=[menu_id])
+    return await update_table(
         db=db,
         row_identifier=menu_id,
-        update_model=model,
+        update_model=menu_update,
         schema=Menu,
-        return_schema=MenuSchema,
         method=UpdateMethod.PUT,
+        options=[LOAD_MENU_POSITIONS],
     )
 
 
 @admin.delete("/{menu_id}", response_model=MenuSchema)
-async def delete_menu(menu_id: int, db: Session = Depends(get_db())):
-    menu = db.get(Menu, menu_id)
+async def delete_menu(menu_id: int, db: AsyncSession = Depends(get_async_db())):
+    menu = await get_row_by_id(db, Menu, menu_id, options=[LOAD_MENU_POSITIONS])
     if menu is None:
         raise HTTPException(status_code=404, detail="Menu not found")
 
-    db.delete(menu)
-    db.commit()
+    await db.delete(menu)
+    add_tombstone(db, menu)
+    record_change(db, menus=[menu], kind=DELETED)
+    await db.commit()
     return menu
 
 
+async def get_menu_snapshot_response(db: AsyncSession, menu_id: int) -> Response:
+    snapshot = (await get_menu_snapshots(db, [menu_id])).get(menu_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Menu not found")
+    return snapshot.to_response()
+
+
 @admin.post("/{menu_id}/add_position/{menu_position_id}", response_model=MenuSchema)
 async def add_position_to_menu(
     menu_id: int,
     menu_position_id: int,
-    db: Session = Depends(get_db()),
+    db: AsyncSession = Depends(get_async_db()),
 ):
-    menu, menu_position = get_menu_and_position(db, menu_id, menu_position_id)
+    menu, menu_position = await get_menu_and_position(db, menu_id, menu_position_id)
 
-    if menu_contains_position(db, menu_id, menu_position_id):
+    if await menu_contains_position(db, menu_id, menu_position_id):
         raise HTTPException(
             status_code=400, detail="Menu and position connection already exists"
         )
 
-    menu.positions.append(menu_position)
-    db.commit()
-    return menu
+    await db.execute(
+        insert(MenuMenuPosition).values(
+            menu_id=menu.id, menu_position_id=menu_position.id
+        )
+    )
+    record_change(db, menus=[menu], positions=[menu_position], kind=ATTACHED)
+    await db.commit()
+    return await get_menu_snapshot_response(db, menu.id)
 
 
 @admin.post("/{menu_id}/remove_position/{menu_position_id}", response_model=MenuSchema)
 async def remove_position_from_menu(
     menu_id: int,
     menu_position_id: int,
-    db: Session = Depends(get_db()),
+    db: AsyncSession = Depends(get_async_db()),
 ):
-    menu, menu_position = get_menu_and_position(db, menu_id, menu_position_id)
+    menu, menu_position = await get_menu_and_position(db, menu_id, menu_position_id)
 
-    if not menu_contains_position(db, menu_id, menu_position_id):
+    if not await menu_contains_position(db, menu_id, menu_position_id):
         raise HTTPException(
             status_code=400, detail="Menu and position connection does not exist"
         )
 
-    menu.positions.remove(menu_position)
-    db.commit()
-    return menu
+    await db.execute(
+        delete(MenuMenuPosition).where(
+            MenuMenuPosition.c.menu_id == menu.id,
+            MenuMenuPosition.c.menu_position_id == menu_position.id,
+        )
+    )
+    record_change(db, menus=[menu], positions=[menu_position], kind=DETACHED)
+    await db.commit()
+    return await get_menu_snapshot_response(db, menu.id)
+
+
+@admin.post("/positions", response_model=MenuPositionLinksResultSchema)
+async def update_menus_positions(
+    links: MenuPositionLinksSchema, db: AsyncSession = Depends(get_async_db())
+):
+    return await update_menu_position_links(
+        db,
+        attach=[(link.menu_id, link.menu_position_id) for link in links.attach],
+        detach=[(link.menu_id, link.menu_position_id) for link in links.detach],
+    )
+
+
+@admin.post("/{menu_id}/positions", response_model=MenuPositionLinksResultSchema)
+async def update_menu_positions(
+    menu_id: int,
+    positions: MenuPositionIdsSchema,
+    db: AsyncSession = Depends(get_async_db()),
+):
+    if await get_row_by_id(db, Menu, menu_id) is None:
+        raise HTTPException(status_code=404, detail="Menu not found")
+
+    return await update_menu_position_links(
+        db,
+        attach=[(menu_id, position_id) for position_id in positions.attach],
+        detach=[(menu_id, position_id) for position_id in positions.detach],
+    )
+
+
+async def update_menu_position_links(
+    db: AsyncSession, attach: list[tuple[int, int]], detach: list[tuple[int, int]]
+) -> MenuPositionLinksResultSchema:
+    attach = list(dict.fromkeys(attach))
+    detach = list(dict.fromkeys(detach))
+    if not set(attach).isdisjoint(detach):
+        raise HTTPException(
+            status_code=400, detail="Position cannot be both attached and detached"
+        )
+
+    removed = await detach_menu_positions(db, detach)
+    added = await attach_menu_positions(db, attach)
+    for links, kind in ((removed, DETACHED), (added, ATTACHED)):
+        if links:
+            record_change(
+                db,
+                menus={link.menu_id for link in links},
+                positions={link.menu_position_id for link in links},
+                kind=kind,
+            )
+    await db.commit()
+
+    return MenuPositionLinksResultSchema(added=len(added), removed=len(removed))
@@ -1,32 +1,146 @@
 from http import HTTPStatus
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import Float, Select, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.api.deps import get_db
-from app.api.utils import create_mail_pool_position, update_table
-from app.models.menu import Menu, MenuPosition
+from app.api.deps import get_async_db
+from app.api.export import ndjson_response, stream_menu_positions
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    encode_cursor,
+    get_next_cursor,
+    paginate,
+)
+from app.api.utils import (
+    add_tombstone,
+    create_mail_pool_position,
+    create_mail_pool_positions,
+    get_position_menu_ids,
+    get_row_by_id,
+    is_row_id,
+    replace_position_menus,
+    update_table,
+)
+from app.models.menu import Menu, MenuMenuPosition, MenuPosition
 from app.schemas.menu import (
+    MenuPositionBulkCreateResultSchema,
+    MenuPositionBulkCreateSchema,
+    MenuPositionConflictSchema,
     MenuPositionCreateSchema,
     MenuPositionPatchSchema,
     MenuPositionSchema,
+    MenuPositionsFilterSchema,
+    MenuPositionsQuerySchema,
+    MenuPositionsSearchQuerySchema,
     MenuPositionUpdateSchema,
+    PositionSortParameter,
 )
+from app.utils.changes import CREATED, DELETED, record_change
 from app.utils.enums import UpdateMethod
 
+public = APIRouter()
 admin = APIRouter(dependencies=[Depends(OAuth2PasswordBearer(tokenUrl="token"))])
 
+SEARCH_SORT = "rank"
+MENU_POSITION_BULK_CHUNK_SIZE = 1000
+POSITION_SORT_KEYS = {
+    PositionSortParameter.NAME: [MenuPosition.name, MenuPosition.id],
+    PositionSortParameter.PRICE: [MenuPosition.price, MenuPosition.id],
+    PositionSortParameter.PREPARATION_TIME: [
+        MenuPosition.preparation_time,
+        MenuPosition.id,
+    ],
+}
+
+
+@public.get("/", response_model=List[MenuPositionSchema])
+async def list_menu_positions(
+    response: Response,
+    query: MenuPositionsQuerySchema = Depends(),
+    db: AsyncSession = Depends(get_async_db()),
+):
+    positions = (await db.scalars(select_menu_positions(query))).all()
+
+    next_cursor = get_next_cursor(
+        positions, query.sortby.value, POSITION_SORT_KEYS[query.sortby], query.limit
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return positions
+
+
+def select_menu_positions(query: MenuPositionsQuerySchema) -> Select:
+    results = filter_menu_positions(select(MenuPosition), query)
+    keys = POSITION_SORT_KEYS[query.sortby]
+    return paginate(results, query.sortby.value, keys, query.cursor, query.limit)
+
+
+@public.get("/search", response_model=List[MenuPositionSchema])
+async def search_menu_positions(
+    response: Response,
+    query: MenuPositionsSearchQuerySchema = Depends(),
+    db: AsyncSession = Depends(get_async_db()),
+):
+    rows = (await db.execute(select_menu_positions_search(query))).all()
+
+    if len(rows) == query.limit:
+        position, rank = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            SEARCH_SORT, [-rank, position.id]
+        )
+    return [position for position, _ in rows]
+
+
+def select_menu_positions_search(query: MenuPositionsSearchQuerySchema) -> Select:
+    ts_query = func.websearch_to_tsquery("simple", query.q)
+    rank = func.ts_rank_cd(MenuPosition.search_vector, ts_query, type_=Float)
+    results = select(MenuPosition, rank).where(
+        MenuPosition.search_vector.bool_op("@@")(ts_query)
+    )
+
+    results = filter_menu_positions(results, query)
+    keys = [-rank, MenuPosition.id]
+    return paginate(results, SEARCH_SORT, keys, query.cursor, query.limit)
+
+
+def filter_menu_positions(results: Select, query: MenuPositionsFilterSchema) -> Select:
+    if query.is_vegan is not None:
+        results = results.where(MenuPosition.is_vegan == query.is_vegan)
+
+    if query.price_min is not None:
+        results = results.where(MenuPosition.price >= query.price_min)
+
+    if query.price_max is not None:
+        results = results.where(MenuPosition.price <= query.price_max)
+
+    if query.preparation_time_min is not None:
+        results = results.where(
+            MenuPosition.preparation_time >= query.preparation_time_min
+        )
+
+    if query.preparation_time_max is not None:
+        results = results.where(
+            MenuPosition.preparation_time <= query.preparation_time_max
+        )
+
+    return results
+
 
 @admin.post("/", response_model=MenuPositionSchema, status_code=HTTPStatus.CREATED)
 async def create_menu_position(
-    menu_position: MenuPositionCreateSchema, db: Session = Depends(get_db())
+    menu_position: MenuPositionCreateSchema, db: AsyncSession = Depends(get_async_db())
 ):
 
     if menu_position.menus is not None:
-        menus = db.query(Menu).filter(Menu.id.in_(menu_position.menus)).all()
+        menu_ids = [i for i in menu_position.menus if is_row_id(i)]
+        menus = (await db.scalars(select(Menu).where(Menu.id.in_(menu_ids)))).all()
     else:
         menus = []
 
@@ -40,12 +154,13 @@ async def create_menu_position(
     )
     try:
         db.add(position)
-        db.commit()
+        record_change(db, menus=menus, positions=[position], kind=CREATED)
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Position already exists")
 
-    create_mail_pool_position(
+    await create_mail_pool_position(
         db,
         position.id,
         updated=False,
@@ -53,14 +168,77 @@ async def create_menu_position(
     return position
 
 
+@admin.post("/bulk", response_model=MenuPositionBulkCreateResultSchema)
+async def create_menu_positions(
+    bulk: MenuPositionBulkCreateSchema, db: AsyncSession = Depends(get_async_db())
+):
+    items = bulk.positions
+    menu_ids = {
+        menu_id for item in items for menu_id in item.menus if is_row_id(menu_id)
+    }
+    if menu_ids:
+        menu_ids = set(
+            (await db.scalars(select(Menu.id).where(Menu.id.in_(menu_ids)))).all()
+        )
+
+    inserted = {}
+    for start in range(0, len(items), MENU_POSITION_BULK_CHUNK_SIZE):
+        chunk = items[start : start + MENU_POSITION_BULK_CHUNK_SIZE]
+        statement = (
+            insert(MenuPosition)
+            .values([item.model_dump(exclude={"menus"}) for item in chunk])
+            .on_conflict_do_nothing(constraint="uq_menu_position_name")
+            .returning(MenuPosition)
+        )
+        for position in await db.scalars(statement):
+            inserted[position.name] = position
+
+    created, conflicts, links = [], [], []
+    for index, item in enumerate(items):
+        position = inserted.pop(item.name, None)
+        if position is None:
+            conflicts.append(MenuPositionConflictSchema(index=index, name=item.name))
+            continue
+
+        created.append(position)
+        links.extend(
+            {"menu_id": menu_id, "menu_position_id": position.id}
+            for menu_id in dict.fromkeys(item.menus)
+            if menu_id in menu_ids
+        )
+
+    if created:
+        if links:
+            await db.execute(insert(MenuMenuPosition), links)
+        await create_mail_pool_positions(
+            db, [position.id for position in created], updated=False
+        )
+        record_change(
+            db,
+            menus={link["menu_id"] for link in links},
+            positions=created,
+            kind=CREATED,
+        )
+        await db.commit()
+
+    return MenuPositionBulkCreateResultSchema(created=created, conflicts=conflicts)
+
+
+@admin.get("/export", response_class=StreamingResponse)
+async def export_menu_positions():
+    return ndjson_response(stream_menu_positions())
+
+
 @admin.get("/", response_model=List[MenuPositionSchema])
-async def get_menu_positions(db: Session = Depends(get_db())):
-    return db.query(MenuPosition).all()
+async def get_menu_positions(db: AsyncSession = Depends(get_async_db())):
+    return (await db.scalars(select(MenuPosition))).all()
 
 
 @admin.get("/{menu_position_id}", response_model=MenuPositionSchema)
-async def get_menu_position(menu_position_id: int, db: Session = Depends(get_db())):
-    menu_position = db.get(MenuPosition, menu_position_id)
+async def get_menu_position(
+    menu_position_id: int, db: AsyncSession = Depends(get_async_db())
+):
+    menu_position = await get_row_by_id(db, MenuPosition, menu_position_id)
     if menu_position is None:
         raise HTTPException(status_code=404, detail="Menu position not found")
 
@@ -71,34 +249,27 @@ async def get_menu_position(menu_position_id: int, db: Session = Depends(get_db(
 async def patch_menu_position(
     menu_position_id: int,
     menu_position_update: MenuPositionPatchSchema,
-    db: Session = Depends(get_db()),
+    db: AsyncSession = Depends(get_async_db()),
 ):
-    if menu_position_update.menus is not None:
-        menus = db.query(Menu).filter(Menu.id.in_(menu_position_update.menus)).all()
-    else:
-        menus = None
-
-    model = MenuPositionPatchSchema(
-        name=menu_position_update.name,
-        price=menu_position_update.price,
-        description=menu_position_update.description,
-        preparation_time=menu_position_update.preparation_time,
-        is_vegan=menu_position_update.is_vegan,
-        menus=menus,
-    )
-
-    create_mail_pool_position(
+    await create_mail_pool_position(
         db,
         menu_position_id,
         updated=False,
     )
 
-    return update_table(
+    menus = await get_position_menu_ids(db, menu_position_id)
+    if menu_position_update.menus is not None:
+        added, _ = await replace_position_menus(
+            db, menu_position_id, menu_position_update.menus
+        )
+        menus = [*menus, *added]
+
+    record_change(db, menus=menus, positions=[menu_position_id])
+    return await update_table(
         db=db,
         row_identifier=menu_position_id,
-        update_model=model,
+        update_model=menu_position_update,
         schema=MenuPosition,
-        return_schema=MenuPositionSchema,
         method=UpdateMethod.PATCH,
     )
 
@@ -107,43 +278,47 @@ async def patch_menu_position(
 async def update_menu_position(
     menu_position_id: int,
     menu_position_update: MenuPositionUpdateSchema,
-    db: Session = Depends(get_db()),
+    db: AsyncSession = Depends(get_async_db()),
 ):
-    model = MenuPositionUpdateSchema(
-        name=menu_position_update.name,
-        price=menu_position_update.price,
-        description=menu_position_update.description,
-        preparation_time=menu_position_update.preparation_time,
-        is_vegan=menu_position_update.is_vegan,
-        menus=db.query(Menu).filter(Menu.id.in_(menu_position_update.menus)).all(),
-    )
-
-    create_mail_pool_position(
+    await create_mail_pool_position(
         db,
         menu_position_id,
         updated=False,
     )
 
-    return update_table(
+    menus = await get_position_menu_ids(db, menu_position_id)
+    added, _ = await replace_position_menus(
+        db, menu_position_id, menu_position_update.menus
+    )
+
+    record_change(db, menus=[*menus, *added], positions=[menu_position_id])
+    return await update_table(
         db=db,
         row_identifier=menu_position_id,
-        update_model=model,
+        update_model=menu_position_update,
         schema=MenuPosition,
-        return_schema=MenuPositionSchema,
         method=UpdateMethod.PUT,
     )
 
 
 @admin.delete("/{menu_position_id}", response_model=MenuPositionSchema)
-async def delete_menu_position(menu_position_id: int, db: Session = Depends(get_db())):
-    menu_position = db.get(MenuPosition, menu_position_id)
+async def delete_menu_position(
+    menu_position_id: int, db: AsyncSession = Depends(get_async_db())
+):
+    menu_position = await get_row_by_id(
+        db,
+        MenuPosition,
+        menu_position_id,
+        options=[selectinload(MenuPosition.menus)],
+    )
     if menu_position is None:
         raise HTTPException(status_code=404, detail="Menu position not found")
 
-    for menu in menu_position.menus:
-        menu.positions.remove(menu_position)
-
-    db.delete(menu_position)
-    db.commit()
+    await db.delete(menu_position)
+    add_tombstone(db, menu_position)
+    record_change(
+        db, menus=menu_position.menus, positions=[menu_position], kind=DELETED
+    )
+    await db.commit()
 
     return menu_position
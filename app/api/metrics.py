@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import OAuth2PasswordBearer
+
+from app.db import get_async_engine, get_engine, get_pool_status
+from app.schemas.other import (
+    CacheStatusSchema,
+    CoalescingStatusSchema,
+    PoolStatusSchema,
+    StreamStatusSchema,
+)
+from app.settings import settings
+from app.utils.broadcast import menu_broadcaster
+from app.utils.cache import menu_cache, menu_loads
+
+admin = APIRouter(dependencies=[Depends(OAuth2PasswordBearer(tokenUrl="token"))])
+
+
+@admin.get("/database", response_model=dict[str, PoolStatusSchema])
+async def get_database_pool_metrics():
+    return {
+        "sync": get_pool_status(get_engine(settings.database)),
+        "async": get_pool_status(get_async_engine(settings.database).sync_engine),
+    }
+
+
+@admin.get("/cache", response_model=dict[str, CacheStatusSchema])
+async def get_cache_metrics():
+    return {"menu": menu_cache.status()}
+
+
+@admin.get("/coalescing", response_model=dict[str, CoalescingStatusSchema])
+async def get_coalescing_metrics():
+    return {"menu": menu_loads.status()}
+
+
+@admin.get("/stream", response_model=dict[str, StreamStatusSchema])
+async def get_stream_metrics():
+    return {"menu": menu_broadcaster.status()}
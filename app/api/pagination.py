@@ -0,0 +1,59 @@
+import base64
+import binascii
+import json
+import math
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+
+from app.utils.vars import MAX_INT_64
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort: str, values: list[Any]) -> str:
+    payload = json.dumps({"sort": sort, "values": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: str, keys: list[Any]) -> list[Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = payload["values"]
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if payload.get("sort") != sort or len(values) != len(keys):
+        raise HTTPException(status_code=400, detail="Cursor does not match sorting")
+    if not all(is_valid_cursor_value(key, value) for key, value in zip(keys, values)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def is_valid_cursor_value(key: Any, value: Any) -> bool:
+    python_type = key.type.python_type
+    if python_type is int:
+        return type(value) is int and -MAX_INT_64 - 1 <= value <= MAX_INT_64
+    if python_type is float:
+        return type(value) in (int, float) and math.isfinite(value)
+    if python_type is str:
+        return type(value) is str and "\x00" not in value
+    return isinstance(value, python_type)
+
+
+def paginate(
+    statement: Select, sort: str, keys: list[Any], cursor: Optional[str], limit: int
+) -> Select:
+    if cursor is not None:
+        values = decode_cursor(cursor, sort, keys)
+        statement = statement.where(tuple_(*keys) > tuple(values))
+    return statement.order_by(*keys).limit(limit)
+
+
+def get_next_cursor(
+    rows: Sequence[Any], sort: str, keys: list[Any], limit: int
+) -> Optional[str]:
+    if len(rows) < limit:
+        return None
+    return encode_cursor(sort, [getattr(rows[-1], key.key) for key in keys])
@@ -0,0 +1,195 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+import orjson
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.api.conditional import get_conditional_headers, make_etag
+from app.models.menu import Menu, MenuPosition
+from app.schemas.menu import MenuPositionSchema, MenuSchema
+from app.settings import settings
+
+MENUS_ADAPTER = TypeAdapter(List[MenuSchema])
+
+MENU_FIELDS = tuple(MenuSchema.model_fields)
+MENU_POSITION_FIELDS = tuple(MenuPositionSchema.model_fields)
+
+MENU_COLUMN_FIELDS = tuple(field for field in MENU_FIELDS if field != "positions")
+POSITIONS_FIELD = "positions"
+
+MenusVersion = tuple[
+    list[int], Optional[datetime], list[tuple[int, int]], Optional[datetime]
+]
+
+
+def get_menus_version(menus: Sequence[Menu]) -> MenusVersion:
+    return (
+        [menu.id for menu in menus],
+        max((menu.updated_at for menu in menus), default=None),
+        sorted((menu.id, position.id) for menu in menus for position in menu.positions),
+        max(
+            (position.updated_at for menu in menus for position in menu.positions),
+            default=None,
+        ),
+    )
+
+
+def get_version_headers(version: MenusVersion) -> dict[str, str]:
+    timestamps = [value for value in (version[1], version[3]) if value is not None]
+    return get_conditional_headers(make_etag(*version), max(timestamps, default=None))
+
+
+@dataclass(frozen=True)
+class MenuFieldset:
+    menu_fields: tuple[str, ...]
+    position_fields: Optional[tuple[str, ...]]
+
+
+def split_fields(fields: str) -> set[str]:
+    return {field.strip() for field in fields.split(",")}
+
+
+def parse_menu_fieldset(
+    fields: Optional[str], include: Optional[str]
+) -> Optional[MenuFieldset]:
+    included = set() if include is None else split_fields(include)
+    if included - {POSITIONS_FIELD}:
+        raise HTTPException(status_code=400, detail="Only positions can be included")
+    if fields is None:
+        return None
+
+    requested = split_fields(fields)
+    position_fields = {
+        field.removeprefix(POSITIONS_FIELD + ".")
+        for field in requested
+        if field.startswith(POSITIONS_FIELD + ".")
+    }
+    menu_fields = requested - {POSITIONS_FIELD + "." + f for f in position_fields}
+    unknown = (menu_fields - {*MENU_COLUMN_FIELDS, POSITIONS_FIELD}) | {
+        POSITIONS_FIELD + "." + field
+        for field in position_fields - set(MENU_POSITION_FIELDS)
+    }
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+
+    if position_fields:
+        positions = tuple(f for f in MENU_POSITION_FIELDS if f in position_fields)
+    elif POSITIONS_FIELD in menu_fields or POSITIONS_FIELD in included:
+        positions = MENU_POSITION_FIELDS
+    else:
+        positions = None
+
+    fieldset = MenuFieldset(
+        tuple(field for field in MENU_COLUMN_FIELDS if field in menu_fields),
+        positions,
+    )
+    if fieldset == MenuFieldset(MENU_COLUMN_FIELDS, MENU_POSITION_FIELDS):
+        return None
+    return fieldset
+
+
+def get_menu_fieldset_options(
+    fieldset: MenuFieldset, *columns: Any
+) -> list[LoaderOption]:
+    options = [
+        load_only(
+            *[getattr(Menu, field) for field in fieldset.menu_fields],
+            Menu.updated_at,
+            *columns,
+        )
+    ]
+    if fieldset.position_fields is not None:
+        options.append(
+            selectinload(Menu.positions).load_only(
+                *[getattr(MenuPosition, field) for field in fieldset.position_fields]
+            )
+        )
+    return options
+
+
+def get_fieldset_headers(
+    fieldset: MenuFieldset,
+    menu_ids: list[int],
+    updated_at: Optional[datetime],
+    links: list[tuple[int, int]],
+) -> dict[str, str]:
+    if fieldset.position_fields is None:
+        links = []
+    return get_conditional_headers(
+        make_etag(fieldset, menu_ids, updated_at, links), updated_at
+    )
+
+
+def get_sparse_version_headers(
+    menus: Sequence[Menu], fieldset: MenuFieldset
+) -> dict[str, str]:
+    links = []
+    if fieldset.position_fields is not None:
+        links = sorted(
+            (menu.id, position.id) for menu in menus for position in menu.positions
+        )
+    return get_fieldset_headers(
+        fieldset,
+        [menu.id for menu in menus],
+        max((menu.updated_at for menu in menus), default=None),
+        links,
+    )
+
+
+def build_sparse_menu(menu: Menu, fieldset: MenuFieldset) -> dict[str, Any]:
+    menu_dict = {}
+    for field in MENU_FIELDS:
+        if field in fieldset.menu_fields:
+            menu_dict[field] = getattr(menu, field)
+        elif field == POSITIONS_FIELD and fieldset.position_fields is not None:
+            menu_dict[field] = [
+                {name: getattr(position, name) for name in fieldset.position_fields}
+                for position in menu.positions
+            ]
+    return menu_dict
+
+
+def dump_sparse_menus(menus: Sequence[Menu], fieldset: MenuFieldset) -> bytes:
+    return orjson.dumps([build_sparse_menu(menu, fieldset) for menu in menus])
+
+
+def dump_sparse_menu(menu: Menu, fieldset: MenuFieldset) -> bytes:
+    return orjson.dumps(build_sparse_menu(menu, fieldset))
+
+
+def build_menu_position(position: MenuPosition) -> dict[str, Any]:
+    return {field: getattr(position, field) for field in MENU_POSITION_FIELDS}
+
+
+def build_menu(menu: Menu) -> dict[str, Any]:
+    menu_dict = {field: getattr(menu, field) for field in MENU_FIELDS}
+    menu_dict["positions"] = [
+        build_menu_position(position) for position in menu.positions
+    ]
+    return menu_dict
+
+
+def dump_menus(menus: Sequence[Menu]) -> bytes:
+    if settings.fast_json_responses:
+        return orjson.dumps([build_menu(menu) for menu in menus])
+    return MENUS_ADAPTER.dump_json(
+        MENUS_ADAPTER.validate_python(menus, from_attributes=True)
+    )
+
+
+def dump_menu(menu: Menu) -> bytes:
+    if settings.fast_json_responses:
+        return orjson.dumps(build_menu(menu))
+    return MenuSchema.model_validate(menu).model_dump_json().encode()
+
+
+def dump_menu_position(position: MenuPosition) -> bytes:
+    if settings.fast_json_responses:
+        return orjson.dumps(build_menu_position(position))
+    return MenuPositionSchema.model_validate(position).model_dump_json().encode()
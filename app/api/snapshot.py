@@ -0,0 +1,120 @@
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.conditional import ETAG_HEADER, LAST_MODIFIED_HEADER
+from app.api.serialization import (
+    MENU_COLUMN_FIELDS,
+    MENU_POSITION_FIELDS,
+    dump_menu,
+    get_menus_version,
+    get_version_headers,
+)
+from app.api.utils import is_row_id
+from app.models.menu import Menu, MenuMenuPosition, MenuPosition, MenuSnapshot
+from app.utils.cache import CachedResponse
+from app.utils.changes import Changes, on_commit_changes
+
+
+def build_menu_snapshot(menu: Menu) -> dict:
+    headers = get_version_headers(get_menus_version([menu]))
+    return {
+        "menu_id": menu.id,
+        "body": dump_menu(menu),
+        "etag": headers[ETAG_HEADER],
+        "last_modified": headers.get(LAST_MODIFIED_HEADER),
+    }
+
+
+def to_cached_response(snapshot: dict) -> CachedResponse:
+    headers = {ETAG_HEADER: snapshot["etag"]}
+    if snapshot["last_modified"] is not None:
+        headers[LAST_MODIFIED_HEADER] = snapshot["last_modified"]
+    return CachedResponse(snapshot["body"], headers)
+
+
+def select_menu_rows(session: Session, menu_ids: set[int]) -> list[Any]:
+    menus = session.execute(
+        select(*[getattr(Menu, field) for field in MENU_COLUMN_FIELDS]).where(
+            Menu.id.in_(menu_ids)
+        )
+    ).all()
+    if not menus:
+        return []
+
+    positions = defaultdict(list)
+    rows = session.execute(
+        select(
+            MenuMenuPosition.c.menu_id,
+            *[getattr(MenuPosition, field) for field in MENU_POSITION_FIELDS],
+        )
+        .join(MenuPosition, MenuPosition.id == MenuMenuPosition.c.menu_position_id)
+        .where(MenuMenuPosition.c.menu_id.in_([menu.id for menu in menus]))
+        .order_by(MenuMenuPosition.c.menu_id, MenuPosition.id)
+    )
+    for row in rows:
+        positions[row.menu_id].append(row)
+
+    return [
+        SimpleNamespace(**menu._mapping, positions=positions[menu.id]) for menu in menus
+    ]
+
+
+@on_commit_changes
+def refresh_menu_snapshots(session: Session, changes: Changes) -> None:
+    if not changes.menus:
+        return
+
+    menus = select_menu_rows(session, changes.menus)
+    if not menus:
+        return
+
+    statement = insert(MenuSnapshot).values([build_menu_snapshot(m) for m in menus])
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[MenuSnapshot.menu_id],
+            set_={
+                "body": statement.excluded.body,
+                "etag": statement.excluded.etag,
+                "last_modified": statement.excluded.last_modified,
+            },
+        )
+    )
+
+
+async def get_menu_snapshots(
+    db: AsyncSession, menu_ids: list[int]
+) -> dict[int, CachedResponse]:
+    menu_ids = [menu_id for menu_id in menu_ids if is_row_id(menu_id)]
+    if not menu_ids:
+        return {}
+
+    snapshots = await db.execute(
+        select(
+            MenuSnapshot.menu_id,
+            MenuSnapshot.body,
+            MenuSnapshot.etag,
+            MenuSnapshot.last_modified,
+        ).where(MenuSnapshot.menu_id.in_(menu_ids))
+    )
+    return {
+        snapshot.menu_id: to_cached_response(snapshot._asdict())
+        for snapshot in snapshots
+    }
+
+
+async def store_menu_snapshots(
+    db: AsyncSession, menus: list[Menu]
+) -> dict[int, CachedResponse]:
+    snapshots = [build_menu_snapshot(menu) for menu in menus]
+    if snapshots:
+        await db.execute(
+            insert(MenuSnapshot).values(snapshots).on_conflict_do_nothing()
+        )
+        await db.commit()
+    return {snapshot["menu_id"]: to_cached_response(snapshot) for snapshot in snapshots}
@@ -3,9 +3,10 @@ from http import HTTPStatus
 
 from fastapi import APIRouter, Depends
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db
+from app.api.deps import get_async_db
 from app.api.utils import add_row_to_table
 from app.models.user import User
 from app.schemas.user import UserCreateSchema, UserSchema
@@ -17,12 +18,12 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 @admin.post("/", response_model=UserSchema, status_code=HTTPStatus.CREATED)
 async def create_user(
     user: UserCreateSchema,
-    db: Session = Depends(get_db()),
+    db: AsyncSession = Depends(get_async_db()),
 ):
     user.password = pwd_context.hash(user.password)
-    return add_row_to_table(db, User(**user.dict() | {"id": uuid.uuid4()}))
+    return await add_row_to_table(db, User(**user.dict() | {"id": uuid.uuid4()}))
 
 
 @admin.get("/", response_model=list[UserSchema])
-async def get_users(db: Session = Depends(get_db())):
-    return db.query(User).all()
+async def get_users(db: AsyncSession = Depends(get_async_db())):
+    return (await db.scalars(select(User))).all()
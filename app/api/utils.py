@@ -1,87 +1,280 @@
 import datetime
+from typing import Sequence
 
 from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    Integer,
+    Row,
+    Select,
+    all_,
+    any_,
+    delete,
+    exists,
+    func,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.db import Base
 from app.models.mail_pool import MailPool
-from app.models.menu import Menu, MenuPosition
+from app.models.menu import Menu, MenuMenuPosition, MenuPosition, Tombstone
 from app.models.user import User
 from app.settings import settings
 from app.utils.enums import UpdateMethod
+from app.utils.vars import MAX_INT_64
 
+LOAD_MENU_POSITIONS = selectinload(Menu.positions)
 
-def update_table(
-    db: Session,
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def is_row_id(value: int) -> bool:
+    return 0 < value <= MAX_INT_64
+
+
+async def get_row_by_id(
+    db: AsyncSession, schema: Base, row_identifier: int, **kwargs
+) -> Base | None:
+    if not is_row_id(row_identifier):
+        return None
+    return await db.get(schema, row_identifier, **kwargs)
+
+
+async def update_table(
+    db: AsyncSession,
     row_identifier: int,
     update_model: BaseModel,
     schema: Base,
-    return_schema: Base,
     method: str,
-):
-    row = db.get(schema, row_identifier)
-    if row is None:
+    options: Sequence[ORMOption] = (),
+) -> Base:
+    if not is_row_id(row_identifier):
         raise HTTPException(status_code=404, detail="Object not found")
 
     if method == UpdateMethod.PATCH:
-        update_data = update_model.dict(exclude_unset=True, exclude_none=True)
+        update_data = update_model.model_dump(exclude_unset=True, exclude_none=True)
     else:
-        update_data = update_model.dict(exclude_unset=True)
+        update_data = update_model.model_dump(exclude_unset=True)
 
-    for key, value in update_data.items():
-        if hasattr(row, key):
-            setattr(row, key, value)
+    columns = schema.__table__.columns
+    values = {key: value for key, value in update_data.items() if key in columns}
 
-    db.add(row)
-    db.commit()
-    return return_schema.from_orm(row)
+    if values:
+        statement = update(schema).values(values).returning(schema)
+    else:
+        statement = select(schema)
+    row = await db.scalar(
+        statement.where(schema.id == row_identifier)
+        .options(*options)
+        .execution_options(populate_existing=True)
+    )
+    if row is None:
+        raise HTTPException(status_code=404, detail="Object not found")
 
+    await db.commit()
+    return row
 
-def menu_contains_position(db: Session, menu_id: int, position_id: int):
-    query = db.get(Menu, menu_id)
 
-    for position in query.positions:
-        if position.id == position_id:
-            return True
+async def menu_contains_position(
+    db: AsyncSession, menu_id: int, position_id: int
+) -> bool:
+    return await db.scalar(
+        select(
+            exists().where(
+                MenuMenuPosition.c.menu_id == menu_id,
+                MenuMenuPosition.c.menu_position_id == position_id,
+            )
+        )
+    )
+
+
+async def get_position_menu_ids(db: AsyncSession, position_id: int) -> list[int]:
+    return (
+        await db.scalars(
+            select(MenuMenuPosition.c.menu_id).where(
+                MenuMenuPosition.c.menu_position_id == position_id
+            )
+        )
+    ).all()
+
+
+def select_menu_position_links(links: list[tuple[int, int]]) -> Select:
+    menu_ids, position_ids = zip(*links)
+    pairs = (
+        func.unnest(
+            literal(list(menu_ids), ARRAY(Integer)),
+            literal(list(position_ids), ARRAY(Integer)),
+        )
+        .table_valued("menu_id", "menu_position_id")
+        .render_derived()
+    )
+    return select(pairs.c.menu_id, pairs.c.menu_position_id)
+
+
+async def attach_menu_positions(
+    db: AsyncSession, links: list[tuple[int, int]]
+) -> list[Row]:
+    if not links:
+        return []
+
+    pairs = select_menu_position_links(links).subquery()
+    statement = (
+        insert(MenuMenuPosition)
+        .from_select(
+            ["menu_id", "menu_position_id"],
+            select(pairs.c.menu_id, pairs.c.menu_position_id)
+            .join(Menu, Menu.id == pairs.c.menu_id)
+            .join(MenuPosition, MenuPosition.id == pairs.c.menu_position_id),
+        )
+        .on_conflict_do_nothing()
+        .returning(MenuMenuPosition.c.menu_id, MenuMenuPosition.c.menu_position_id)
+    )
+    return (await db.execute(statement)).all()
+
+
+async def detach_menu_positions(
+    db: AsyncSession, links: list[tuple[int, int]]
+) -> list[Row]:
+    if not links:
+        return []
+
+    statement = (
+        delete(MenuMenuPosition)
+        .where(
+            tuple_(MenuMenuPosition.c.menu_id, MenuMenuPosition.c.menu_position_id).in_(
+                select_menu_position_links(links)
+            )
+        )
+        .returning(MenuMenuPosition.c.menu_id, MenuMenuPosition.c.menu_position_id)
+    )
+    return (await db.execute(statement)).all()
 
-    return False
 
+def get_referenced_column(column: Column) -> Column:
+    (foreign_key,) = column.foreign_keys
+    return foreign_key.column
 
-def get_menu_and_position(db, menu_id, menu_position_id):
-    menu = db.get(Menu, menu_id)
+
+async def replace_links(
+    db: AsyncSession, owner: Column, other: Column, owner_id: int, other_ids: list[int]
+) -> tuple[list[int], list[int]]:
+    if not is_row_id(owner_id):
+        return [], []
+
+    ids = literal(
+        list(dict.fromkeys(i for i in other_ids if is_row_id(i))),
+        ARRAY(Integer),
+    )
+    removed = await db.scalars(
+        delete(owner.table)
+        .where(owner == owner_id, other != all_(ids))
+        .returning(other)
+    )
+    removed = removed.all()
+
+    owner_key, other_key = get_referenced_column(owner), get_referenced_column(other)
+    added = await db.scalars(
+        insert(owner.table)
+        .from_select(
+            [owner.name, other.name],
+            select(owner_key, other_key)
+            .join_from(owner_key.table, other_key.table, other_key == any_(ids))
+            .where(owner_key == owner_id),
+        )
+        .on_conflict_do_nothing()
+        .returning(other)
+    )
+    return added.all(), removed
+
+
+async def replace_menu_positions(
+    db: AsyncSession, menu_id: int, position_ids: list[int]
+) -> tuple[list[int], list[int]]:
+    return await replace_links(
+        db,
+        MenuMenuPosition.c.menu_id,
+        MenuMenuPosition.c.menu_position_id,
+        menu_id,
+        position_ids,
+    )
+
+
+async def replace_position_menus(
+    db: AsyncSession, position_id: int, menu_ids: list[int]
+) -> tuple[list[int], list[int]]:
+    return await replace_links(
+        db,
+        MenuMenuPosition.c.menu_position_id,
+        MenuMenuPosition.c.menu_id,
+        position_id,
+        menu_ids,
+    )
+
+
+async def get_menu_and_position(db, menu_id, menu_position_id):
+    menu = await get_row_by_id(db, Menu, menu_id)
     if menu is None:
         raise HTTPException(status_code=404, detail="Menu not found")
-    menu_position = db.get(MenuPosition, menu_position_id)
+    menu_position = await get_row_by_id(db, MenuPosition, menu_position_id)
     if menu_position is None:
         raise HTTPException(status_code=404, detail="Menu position not found")
     return menu, menu_position
 
 
-def add_row_to_table(db: Session, row: Base) -> Base:
+def add_tombstone(db: AsyncSession, row: Base) -> None:
+    db.add(Tombstone(table_name=row.__tablename__, row_id=row.id))
+
+
+async def add_row_to_table(db: AsyncSession, row: Base) -> Base:
     try:
         db.add(row)
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=400, detail="Object already exists or other error occurred"
         )
     return row
 
 
-def create_mail_pool_position(db: Session, position_id: int, updated: bool) -> None:
+async def create_mail_pool_position(
+    db: AsyncSession, position_id: int, updated: bool
+) -> None:
     mail_pool = MailPool(
         position_id=position_id, date=datetime.date.today(), updated=updated
     )
     try:
         db.add(mail_pool)
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
+
+
+async def create_mail_pool_positions(
+    db: AsyncSession, position_ids: list[int], updated: bool
+) -> None:
+    today = datetime.date.today()
+    await db.execute(
+        insert(MailPool).on_conflict_do_nothing(constraint="uq_menu_position_id"),
+        [
+            {"position_id": position_id, "date": today, "updated": updated}
+            for position_id in position_ids
+        ],
+    )
 
 
 def create_access_token(data: dict) -> str:
@@ -104,13 +297,13 @@ def verify_password(
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def authenticate_user(
-    db: Session,
+async def authenticate_user(
+    db: AsyncSession,
     pwd_context: CryptContext,
     login: str,
     password: str,
 ) -> bool | User:
-    user = db.query(User).filter(User.login == login).one_or_none()
+    user = (await db.scalars(select(User).where(User.login == login))).one_or_none()
     if user is None:
         return False
 
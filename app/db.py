@@ -1,12 +1,71 @@
+import threading
+import time
 from typing import Any
 
 from pydantic import SecretStr
-from sqlalchemy import MetaData, create_engine
+from sqlalchemy import MetaData, create_engine, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncAttrs,
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-Base = declarative_base()
+from app.settings import settings
+
+Base = declarative_base(cls=AsyncAttrs)
 Meta = MetaData()
 
+_engines: dict[str, Engine] = {}
+_async_engines: dict[str, AsyncEngine] = {}
+_engines_lock = threading.Lock()
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_checkout(self, wait_seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+
+class PoolMetricsMixin:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> Any:
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(PoolMetricsMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncAdaptedQueuePool(PoolMetricsMixin, AsyncAdaptedQueuePool):
+    pass
+
 
 def get_session(database_dsn: SecretStr) -> Any:
     session_constructor = get_session_constructor(database_dsn)
@@ -15,11 +74,81 @@ def get_session(database_dsn: SecretStr) -> Any:
 
 
 def get_session_constructor(database_dsn: SecretStr) -> Any:
-    engine = prepare_database(database_dsn)
+    engine = get_engine(database_dsn)
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def get_engine(database_dsn: SecretStr) -> Engine:
+    dsn = database_dsn.get_secret_value()
+    with _engines_lock:
+        if dsn not in _engines:
+            _engines[dsn] = prepare_database(database_dsn)
+        return _engines[dsn]
+
+
 def prepare_database(database_dsn: SecretStr) -> Any:
     return create_engine(
         database_dsn.get_secret_value(),
+        poolclass=MeteredQueuePool,
+        **get_pool_options(),
     )
+
+
+def get_async_session_constructor(database_dsn: SecretStr) -> Any:
+    engine = get_async_engine(database_dsn)
+    return async_sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def get_async_engine(database_dsn: SecretStr) -> AsyncEngine:
+    dsn = database_dsn.get_secret_value()
+    with _engines_lock:
+        if dsn not in _async_engines:
+            _async_engines[dsn] = prepare_async_database(database_dsn)
+        return _async_engines[dsn]
+
+
+def prepare_async_database(database_dsn: SecretStr) -> AsyncEngine:
+    url = make_url(database_dsn.get_secret_value())
+    return create_async_engine(
+        url.set(drivername="postgresql+asyncpg"),
+        poolclass=MeteredAsyncAdaptedQueuePool,
+        **get_pool_options(),
+    )
+
+
+def get_pool_options() -> dict[str, Any]:
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_timeout": settings.database_pool_timeout,
+    }
+
+
+def dispose_engines() -> None:
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+
+
+async def dispose_async_engines() -> None:
+    with _engines_lock:
+        engines = list(_async_engines.values())
+    for engine in engines:
+        await engine.dispose()
+
+
+def get_pool_status(engine: Engine) -> dict[str, Any]:
+    pool = engine.pool
+    metrics = pool.metrics
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "wait_seconds_total": metrics.wait_seconds_total,
+        "wait_seconds_max": metrics.wait_seconds_max,
+    }
@@ -1,34 +1,68 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import Annotated
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api import menu, menu_position, user
-from app.api.deps import get_db
+from app.api import menu, menu_position, metrics, user
+from app.api.deps import get_async_db
 from app.api.utils import authenticate_user, create_access_token
+from app.db import dispose_async_engines, dispose_engines, get_async_engine, get_engine
 from app.schemas.other import Token
 from app.settings import settings
+from app.utils.cache import menu_loads
 from app.utils.logger import get_logger, setup_logger
 from app.utils.mail_utils import just_clear_mail_pool, send_mail
+from app.utils.notifications import listen_for_changes
 
 setup_logger(settings.log_level)
 logger = get_logger("main")
 logger.info("Starting application")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_engine(settings.database)
+    get_async_engine(settings.database)
+    listener = None
+    if settings.menu_changes_listener_enabled:
+        listener = asyncio.create_task(listen_for_changes(settings.database))
+
+    yield
+
+    if listener is not None:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    await menu_loads.cancel_pending()
+    dispose_engines()
+    await dispose_async_engines()
+
+
 app = FastAPI(
     title="eMenu",
     version=settings.version,
+    lifespan=lifespan,
+    default_response_class=(
+        ORJSONResponse if settings.fast_json_responses else JSONResponse
+    ),
 )
 
 app.include_router(menu.public, prefix="/api/menu", tags=["Menu"])
 app.include_router(menu.admin, prefix="/api/admin/menu", tags=["Menu"])
+app.include_router(
+    menu_position.public, prefix="/api/menu_position", tags=["Menu Position"]
+)
 app.include_router(
     menu_position.admin, prefix="/api/admin/menu_position", tags=["Menu Position"]
 )
 app.include_router(user.admin, prefix="/api/admin/user", tags=["User"])
+app.include_router(metrics.admin, prefix="/api/admin/metrics", tags=["Metrics"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -38,9 +72,11 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 @app.post("/token", include_in_schema=False)
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db()),
+    db: AsyncSession = Depends(get_async_db()),
 ):
-    user = authenticate_user(db, pwd_context, form_data.username, form_data.password)
+    user = await authenticate_user(
+        db, pwd_context, form_data.username, form_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,33 +1,104 @@
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Boolean,
     Column,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Table,
     Text,
     UniqueConstraint,
+    event,
+    text,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db import Base
 
+CURRENT_XACT_ID = text("pg_current_xact_id()::text::bigint")
+
 MenuMenuPosition = Table(
     "menu_menu_position",
     Base.metadata,
-    Column("menu_id", Integer, ForeignKey("menu.id", ondelete="CASCADE")),
     Column(
-        "menu_position_id", Integer, ForeignKey("menu_position.id", ondelete="CASCADE")
+        "menu_id", Integer, ForeignKey("menu.id", ondelete="CASCADE"), primary_key=True
+    ),
+    Column(
+        "menu_position_id",
+        Integer,
+        ForeignKey("menu_position.id", ondelete="CASCADE"),
+        primary_key=True,
     ),
+    Index("ix_menu_menu_position_menu_position_id", "menu_position_id"),
+)
+
+POSITIONS_COUNT_DDL = [
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION update_menu_positions_count() RETURNS trigger AS $$
+        BEGIN
+            UPDATE menu
+            SET positions_count = menu.positions_count
+                + CASE WHEN TG_OP = 'INSERT' THEN changed.count ELSE -changed.count END
+            FROM (
+                SELECT menu_id, count(*) AS count FROM changed_rows GROUP BY menu_id
+            ) AS changed
+            WHERE menu.id = changed.menu_id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    ),
+    DDL(
+        """
+        CREATE TRIGGER menu_positions_count_insert
+        AFTER INSERT ON menu_menu_position
+        REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION update_menu_positions_count()
+        """
+    ),
+    DDL(
+        """
+        CREATE TRIGGER menu_positions_count_delete
+        AFTER DELETE ON menu_menu_position
+        REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION update_menu_positions_count()
+        """
+    ),
+]
+
+for ddl in POSITIONS_COUNT_DDL:
+    event.listen(MenuMenuPosition, "after_create", ddl)
+
+
+MENU_POSITION_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
 )
 
 
 class MenuPosition(Base):
     __tablename__ = "menu_position"
-    __table_args__ = (UniqueConstraint("name", name="uq_menu_position_name"),)
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_menu_position_name"),
+        Index(
+            "ix_menu_position_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        Index("ix_menu_position_name_id", "name", "id"),
+        Index("ix_menu_position_price_id", "price", "id"),
+        Index("ix_menu_position_preparation_time_id", "preparation_time", "id"),
+        Index("ix_menu_position_updated_at", "updated_at"),
+        Index("ix_menu_position_xact_id", "xact_id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(255), nullable=False)
@@ -35,31 +106,124 @@ class MenuPosition(Base):
     description = Column(Text, nullable=True)
     preparation_time = Column(Integer, nullable=False)
     is_vegan = Column(Boolean, default=False)
+    search_vector = Column(
+        TSVECTOR, Computed(MENU_POSITION_SEARCH_VECTOR, persisted=True)
+    )
 
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    xact_id = Column(BigInteger, nullable=False, server_default=CURRENT_XACT_ID)
 
     menus = relationship(
         "Menu",
         secondary=MenuMenuPosition,
         back_populates="positions",
-        cascade="all, delete",
+        order_by="Menu.id",
     )
 
 
 class Menu(Base):
     __tablename__ = "menu"
-    __table_args__ = (UniqueConstraint("name", name="uq_menu_name"),)
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_menu_name"),
+        Index("ix_menu_positions_count_id", "positions_count", "id"),
+        Index("ix_menu_updated_at", "updated_at"),
+        Index("ix_menu_xact_id", "xact_id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
+    positions_count = Column(Integer, nullable=False, server_default="0")
 
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    xact_id = Column(BigInteger, nullable=False, server_default=CURRENT_XACT_ID)
 
     positions = relationship(
         "MenuPosition",
         secondary=MenuMenuPosition,
         back_populates="menus",
-        cascade="all, delete",
+        order_by="MenuPosition.id",
+    )
+
+
+class MenuSnapshot(Base):
+    __tablename__ = "menu_snapshot"
+
+    menu_id = Column(
+        Integer, ForeignKey("menu.id", ondelete="CASCADE"), primary_key=True
+    )
+    body = Column(LargeBinary, nullable=False)
+    etag = Column(String(66), nullable=False)
+    last_modified = Column(String(64), nullable=True)
+
+
+class Tombstone(Base):
+    __tablename__ = "tombstone"
+    __table_args__ = (
+        Index("ix_tombstone_deleted_at", "deleted_at"),
+        Index("ix_tombstone_xact_id", "xact_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String(64), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=func.now())
+    xact_id = Column(BigInteger, nullable=False, server_default=CURRENT_XACT_ID)
+
+
+XACT_ID_FUNCTION_DDL = DDL(
+    """
+    CREATE OR REPLACE FUNCTION set_xact_id() RETURNS trigger AS $$
+    BEGIN
+        NEW.xact_id := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+
+event.listen(Menu.__table__, "after_create", XACT_ID_FUNCTION_DDL)
+event.listen(
+    Menu.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE TRIGGER menu_xact_id
+        BEFORE UPDATE ON menu
+        FOR EACH ROW EXECUTE FUNCTION set_xact_id()
+        """
+    ),
+)
+event.listen(MenuPosition.__table__, "after_create", XACT_ID_FUNCTION_DDL)
+event.listen(
+    MenuPosition.__table__,
+    "after_create",
+    DDL(
+        """
+        CREATE TRIGGER menu_position_xact_id
+        BEFORE UPDATE ON menu_position
+        FOR EACH ROW EXECUTE FUNCTION set_xact_id()
+        """
+    ),
+)
+
+
+def is_pg_trgm_available(ddl, target, bind, **kw) -> bool:
+    return bool(
+        bind.scalar(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        )
+    )
+
+
+NAME_TRGM_DDL = [
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+    DDL("CREATE INDEX ix_menu_name_trgm ON menu USING gin (name gin_trgm_ops)"),
+]
+
+for ddl in NAME_TRGM_DDL:
+    event.listen(
+        Menu.__table__, "after_create", ddl.execute_if(callable_=is_pg_trgm_available)
     )
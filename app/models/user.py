@@ -8,6 +8,7 @@ from app.db import Base
 class User(Base):
     __tablename__ = "users"
     __table_args__ = (UniqueConstraint("login", name="uq_login"),)
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID, primary_key=True, index=True)
     login = Column(String(255), nullable=False)
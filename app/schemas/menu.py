@@ -1,19 +1,25 @@
 from datetime import datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Annotated, Any, Optional
 
 from fastapi import Query
 from pydantic import BaseModel, Field, field_validator
 
+from app.api.feed import to_naive_utc
 from app.models.menu import Menu, MenuPosition
 from app.utils.vars import MAX_INT_64
 
+MENU_POSITION_BULK_MAX_SIZE = 5000
+MENU_POSITION_LINKS_MAX_SIZE = 5000
+
+RowId = Annotated[int, Field(gt=0, le=MAX_INT_64)]
+
 
 class MenuPositionSchema(BaseModel):
     id: int
     name: str = Field(..., min_length=1, max_length=255)
     price: float = Field(..., gt=0, le=MAX_INT_64)
-    description: str
+    description: Optional[str]
     preparation_time: int = Field(..., gt=0, le=MAX_INT_64)
     is_vegan: bool = False
 
@@ -44,6 +50,22 @@ class MenuPositionCreateSchema(BaseModel):
         return validate_menus_type(menus=value)
 
 
+class MenuPositionBulkCreateSchema(BaseModel):
+    positions: list[MenuPositionCreateSchema] = Field(
+        ..., min_length=1, max_length=MENU_POSITION_BULK_MAX_SIZE
+    )
+
+
+class MenuPositionConflictSchema(BaseModel):
+    index: int
+    name: str
+
+
+class MenuPositionBulkCreateResultSchema(BaseModel):
+    created: list[MenuPositionSchema]
+    conflicts: list[MenuPositionConflictSchema]
+
+
 class MenuPositionUpdateSchema(BaseModel):
     name: str = Field(..., min_length=1, max_length=255)
     price: float = Field(..., gt=0, le=MAX_INT_64)
@@ -139,12 +161,47 @@ class MenuUpdateSchema(BaseModel):
         return validate_menu_positions_type(positions=value)
 
 
+class MenuPositionLinkSchema(BaseModel):
+    menu_id: RowId
+    menu_position_id: RowId
+
+
+class MenuPositionLinksSchema(BaseModel):
+    attach: list[MenuPositionLinkSchema] = Field(
+        [], max_length=MENU_POSITION_LINKS_MAX_SIZE
+    )
+    detach: list[MenuPositionLinkSchema] = Field(
+        [], max_length=MENU_POSITION_LINKS_MAX_SIZE
+    )
+
+
+class MenuPositionIdsSchema(BaseModel):
+    attach: list[RowId] = Field([], max_length=MENU_POSITION_LINKS_MAX_SIZE)
+    detach: list[RowId] = Field([], max_length=MENU_POSITION_LINKS_MAX_SIZE)
+
+
+class MenuPositionLinksResultSchema(BaseModel):
+    added: int
+    removed: int
+
+
 class SortParameter(str, Enum):
     NAME = "name"
     POSITIONS_COUNT = "positions_count"
 
 
-class MenusQuerySchema(BaseModel):
+class MenuFieldsQuerySchema(BaseModel):
+    fields: Optional[str] = Query(
+        None,
+        description="Comma separated fields to return, "
+        "for example: 'id,name' or 'id,positions.name,positions.price'",
+    )
+    include: Optional[str] = Query(
+        None, description="Related objects to embed, for example: 'positions'"
+    )
+
+
+class MenusQuerySchema(MenuFieldsQuerySchema):
     sortby: SortParameter = Query(
         SortParameter.NAME,
         description="Available sort parameters: 'name', 'positions_count'",
@@ -167,3 +224,78 @@ class MenusQuerySchema(BaseModel):
     updated_after: Optional[datetime] = Query(
         None, description="Updated after some date, for example: '2022-01-01T00:00:00'"
     )
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of menus")
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor of the next page, taken from 'X-Next-Cursor' header",
+    )
+
+    @field_validator(
+        "created_before", "created_after", "updated_before", "updated_after"
+    )
+    def validate_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        return value if value is None else to_naive_utc(value)
+
+
+class PositionSortParameter(str, Enum):
+    NAME = "name"
+    PRICE = "price"
+    PREPARATION_TIME = "preparation_time"
+
+
+class MenuPositionsFilterSchema(BaseModel):
+    is_vegan: Optional[bool] = Query(None, description="Vegan positions only")
+    price_min: Optional[float] = Query(None, ge=0, description="Minimal price")
+    price_max: Optional[float] = Query(None, ge=0, description="Maximal price")
+    preparation_time_min: Optional[int] = Query(
+        None, ge=0, le=MAX_INT_64, description="Minimal preparation time"
+    )
+    preparation_time_max: Optional[int] = Query(
+        None, ge=0, le=MAX_INT_64, description="Maximal preparation time"
+    )
+
+
+class MenuPositionsQuerySchema(MenuPositionsFilterSchema):
+    sortby: PositionSortParameter = Query(
+        PositionSortParameter.NAME,
+        description="Available sort parameters: 'name', 'price', 'preparation_time'",
+    )
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of positions")
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor of the next page, taken from 'X-Next-Cursor' header",
+    )
+
+
+class MenuPositionsSearchQuerySchema(MenuPositionsFilterSchema):
+    q: str = Query(
+        ...,
+        min_length=1,
+        max_length=255,
+        description="Search phrase, for example: 'spicy -pork' or '\"tomato soup\"'",
+    )
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of positions")
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor of the next page, taken from 'X-Next-Cursor' header",
+    )
+
+
+class MenuBatchQuerySchema(MenuFieldsQuerySchema):
+    ids: str = Query(..., description="Comma separated menu ids, for example: '1,2,3'")
+
+
+class MenuChangesQuerySchema(BaseModel):
+    since: str = Query(
+        ...,
+        description="Watermark from the previous response or a timestamp, "
+        "for example: '2022-01-01T00:00:00'",
+    )
+
+
+class MenuChangesSchema(BaseModel):
+    menus: list[MenuSchema]
+    positions: list[MenuPositionSchema]
+    deleted_menus: list[int]
+    deleted_positions: list[int]
+    watermark: str
@@ -4,3 +4,40 @@ from pydantic import BaseModel
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+
+class PoolStatusSchema(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class CacheStatusSchema(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    stale_hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class CoalescingStatusSchema(BaseModel):
+    in_flight: int
+    loads: int
+    coalesced: int
+    refreshes: int
+    timeouts: int
+
+
+class StreamStatusSchema(BaseModel):
+    subscribers: int
+    queue_size: int
+    published: int
+    dropped: int
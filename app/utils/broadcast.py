@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+import orjson
+
+from app.settings import settings
+from app.utils.changes import ChangeEvent, Changes, on_changes
+
+RESET_EVENT = b"event: reset\ndata: {}\n\n"
+
+
+def format_event(event: ChangeEvent) -> bytes:
+    data = orjson.dumps(
+        {"kind": event.kind, "menus": event.menus, "positions": event.positions}
+    )
+    return b"event: change\ndata: " + data + b"\n\n"
+
+
+class Subscription:
+    def __init__(self, queue_size: int) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.overflowed = False
+        self._messages: deque[bytes] = deque(maxlen=queue_size)
+        self._ready = asyncio.Event()
+
+    def put(self, message: bytes) -> bool:
+        dropped = len(self._messages) == self._messages.maxlen
+        self.overflowed = self.overflowed or dropped
+        self._messages.append(message)
+        self._ready.set()
+        return dropped
+
+    async def get(self, timeout: float) -> Optional[bytes]:
+        if not self._messages:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        if self.overflowed:
+            self.overflowed = False
+            return RESET_EVENT
+        return self._messages.popleft()
+
+
+class Broadcaster:
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self.published = 0
+        self.dropped = 0
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def subscribe(self) -> Iterator[Subscription]:
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions.discard(subscription)
+
+    def publish(self, message: bytes) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+            self.published += 1
+
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for subscription in subscriptions:
+            if subscription.loop is current_loop:
+                self._deliver(subscription, message)
+                continue
+
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    self._deliver, subscription, message
+                )
+            except RuntimeError:
+                pass
+
+    def _deliver(self, subscription: Subscription, message: bytes) -> None:
+        if subscription.put(message):
+            with self._lock:
+                self.dropped += 1
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscriptions),
+                "queue_size": self.queue_size,
+                "published": self.published,
+                "dropped": self.dropped,
+            }
+
+
+menu_broadcaster = Broadcaster(settings.menu_stream_queue_size)
+
+
+@on_changes
+def broadcast_menu_changes(changes: Changes) -> None:
+    if changes.everything:
+        menu_broadcaster.publish(RESET_EVENT)
+    for event in changes.events:
+        menu_broadcaster.publish(format_event(event))
@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Iterable, NamedTuple, Optional
+
+from fastapi import Response
+
+from app.settings import settings
+from app.utils.changes import Changes, on_changes
+from app.utils.singleflight import SingleFlight
+
+MENUS_TAG = "menus"
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def to_response(self) -> Response:
+        return Response(
+            content=self.body, headers=self.headers, media_type="application/json"
+        )
+
+
+class CacheHit(NamedTuple):
+    value: Any
+    age: float
+    stale: bool
+
+
+class CacheMetrics:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+
+class ResponseCache:
+    def __init__(self, max_size: int, ttl: float, stale_ttl: float = 0.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.generation = 0
+        self.metrics = CacheMetrics()
+        self._entries: OrderedDict[Hashable, tuple[float, Any, frozenset]] = (
+            OrderedDict()
+        )
+        self._tags: dict[Hashable, set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        hit = self._lookup(key, allow_stale=False)
+        return None if hit is None else hit.value
+
+    def get_hit(self, key: Hashable) -> Optional[CacheHit]:
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key: Hashable, allow_stale: bool) -> Optional[CacheHit]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics.misses += 1
+                return None
+
+            stored_at, value, _ = entry
+            age = time.monotonic() - stored_at
+            if age >= self.ttl + self.stale_ttl:
+                self._remove(key)
+                self.metrics.expirations += 1
+                self.metrics.misses += 1
+                return None
+
+            stale = age >= self.ttl
+            if stale and not allow_stale:
+                self.metrics.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if stale:
+                self.metrics.stale_hits += 1
+            else:
+                self.metrics.hits += 1
+            return CacheHit(value, age, stale)
+
+    def set(
+        self, key: Hashable, value: Any, generation: int, tags: Iterable[Hashable]
+    ) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            if generation != self.generation:
+                return
+
+            self._remove(key)
+            tags = frozenset(tags)
+            self._entries[key] = (time.monotonic(), value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.metrics.evictions += 1
+
+    def invalidate(self, tags: Iterable[Hashable]) -> None:
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, set()):
+                    self._remove(key)
+                    self.metrics.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.metrics.hits,
+            "stale_hits": self.metrics.stale_hits,
+            "misses": self.metrics.misses,
+            "evictions": self.metrics.evictions,
+            "expirations": self.metrics.expirations,
+            "invalidations": self.metrics.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def menu_tag(menu_id: int) -> tuple[str, int]:
+    return ("menu", menu_id)
+
+
+menu_cache = ResponseCache(
+    settings.menu_cache_size, settings.menu_cache_ttl, settings.menu_cache_stale_ttl
+)
+menu_loads = SingleFlight(settings.menu_load_timeout)
+
+
+@on_changes
+def invalidate_menu_cache(changes: Changes) -> None:
+    menu_loads.forget()
+    if changes.everything:
+        menu_cache.clear()
+    elif changes.menus:
+        menu_cache.invalidate([MENUS_TAG, *map(menu_tag, changes.menus)])
@@ -0,0 +1,153 @@
+import json
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.menu import Menu
+
+PENDING_CHANGES = "pending_changes"
+COMMITTED_CHANGES = "committed_changes"
+CHANGES_CHANNEL = "menu_changes"
+MAX_NOTIFICATION_PAYLOAD = 7900
+
+ORIGIN = uuid.uuid4().hex
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+ATTACHED = "attached"
+DETACHED = "detached"
+
+
+@dataclass
+class ChangeEvent:
+    kind: str
+    menus: list[int] = field(default_factory=list)
+    positions: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Changes:
+    menus: set[int] = field(default_factory=set)
+    positions: set[int] = field(default_factory=set)
+    everything: bool = False
+    events: list[ChangeEvent] = field(default_factory=list)
+
+
+ChangesListener = Callable[[Changes], None]
+CommitHook = Callable[[Session, Changes], None]
+
+_listeners: list[ChangesListener] = []
+_commit_hooks: list[CommitHook] = []
+
+
+def on_changes(listener: ChangesListener) -> ChangesListener:
+    _listeners.append(listener)
+    return listener
+
+
+def on_commit_changes(hook: CommitHook) -> CommitHook:
+    _commit_hooks.append(hook)
+    return hook
+
+
+def dispatch(changes: Changes) -> None:
+    for listener in _listeners:
+        listener(changes)
+
+
+def record_change(
+    db: Any,
+    menus: Iterable[Any] = (),
+    positions: Iterable[Any] = (),
+    kind: str = UPDATED,
+) -> None:
+    pending = db.info.setdefault(PENDING_CHANGES, [])
+    pending.append((kind, list(menus), list(positions)))
+
+
+def get_id(row: Any) -> int:
+    return getattr(row, "id", row)
+
+
+def encode_changes(changes: Changes) -> str:
+    payload = json.dumps(
+        {
+            "origin": ORIGIN,
+            "menus": sorted(changes.menus),
+            "positions": sorted(changes.positions),
+            "events": [
+                [event.kind, event.menus, event.positions] for event in changes.events
+            ],
+        },
+        separators=(",", ":"),
+    )
+    if len(payload) > MAX_NOTIFICATION_PAYLOAD:
+        payload = json.dumps({"origin": ORIGIN, "everything": True})
+    return payload
+
+
+def decode_changes(payload: str) -> tuple[str, Changes]:
+    data = json.loads(payload)
+    return data["origin"], Changes(
+        menus=set(data.get("menus", [])),
+        positions=set(data.get("positions", [])),
+        everything=data.get("everything", False),
+        events=[ChangeEvent(*event) for event in data.get("events", [])],
+    )
+
+
+def touch_menus(session: Session, menu_ids: set[int]) -> None:
+    rows = session.execute(
+        update(Menu)
+        .where(Menu.id.in_(menu_ids))
+        .values(updated_at=func.now())
+        .returning(Menu.id, Menu.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    for menu_id, updated_at in rows:
+        menu = session.identity_map.get(session.identity_key(Menu, menu_id))
+        if menu is not None:
+            set_committed_value(menu, "updated_at", updated_at)
+
+
+@event.listens_for(Session, "before_commit")
+def notify_changes(session: Session) -> None:
+    pending = session.info.pop(PENDING_CHANGES, None)
+    if pending is None:
+        return
+
+    session.flush()
+    changes = Changes()
+    for kind, menus, positions in pending:
+        event = ChangeEvent(
+            kind,
+            sorted({get_id(menu) for menu in menus}),
+            sorted({get_id(position) for position in positions}),
+        )
+        changes.menus.update(event.menus)
+        changes.positions.update(event.positions)
+        changes.events.append(event)
+    if changes.menus:
+        touch_menus(session, changes.menus)
+    for hook in _commit_hooks:
+        hook(session, changes)
+    session.execute(select(func.pg_notify(CHANGES_CHANNEL, encode_changes(changes))))
+    session.info[COMMITTED_CHANGES] = changes
+
+
+@event.listens_for(Session, "after_commit")
+def dispatch_changes(session: Session) -> None:
+    changes = session.info.pop(COMMITTED_CHANGES, None)
+    if changes is not None:
+        dispatch(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_changes(session: Session) -> None:
+    session.info.pop(PENDING_CHANGES, None)
+    session.info.pop(COMMITTED_CHANGES, None)
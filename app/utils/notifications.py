@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any
+
+import asyncpg
+from pydantic import SecretStr
+from sqlalchemy import make_url
+
+from app.utils.changes import CHANGES_CHANNEL, ORIGIN, Changes, decode_changes, dispatch
+from app.utils.logger import get_logger
+
+logger = get_logger("notifications")
+
+RECONNECT_DELAY_MIN = 0.5
+RECONNECT_DELAY_MAX = 30.0
+KEEPALIVE_INTERVAL = 30.0
+
+
+def get_listener_dsn(database_dsn: SecretStr) -> str:
+    url = make_url(database_dsn.get_secret_value()).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def handle_notification(connection: Any, pid: int, channel: str, payload: str) -> None:
+    try:
+        origin, changes = decode_changes(payload)
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Invalid change notification, flushing caches")
+        dispatch(Changes(everything=True))
+        return
+
+    if origin != ORIGIN:
+        dispatch(changes)
+
+
+async def listen_for_changes(database_dsn: SecretStr) -> None:
+    dsn = get_listener_dsn(database_dsn)
+    delay = RECONNECT_DELAY_MIN
+    while True:
+        try:
+            connection = await asyncpg.connect(dsn)
+        except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+            logger.warning("Cannot connect change listener", error=str(e), retry=delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+            continue
+
+        try:
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await connection.add_listener(CHANGES_CHANNEL, handle_notification)
+            dispatch(Changes(everything=True))
+            delay = RECONNECT_DELAY_MIN
+            logger.info("Listening for menu changes")
+
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    await connection.execute("SELECT 1")
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            logger.warning("Change listener connection lost", error=str(e))
+        finally:
+            if not connection.is_closed():
+                await connection.close(timeout=5)
+
+        logger.warning("Change listener disconnected, reconnecting")
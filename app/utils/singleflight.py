@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from app.utils.logger import get_logger
+
+logger = get_logger("singleflight")
+
+T = TypeVar("T")
+
+
+class SingleFlightMetrics:
+    def __init__(self) -> None:
+        self.loads = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.timeouts = 0
+
+
+class SingleFlight:
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.metrics = SingleFlightMetrics()
+        self._flights: dict[Hashable, asyncio.Task] = {}
+        self._pending: set[asyncio.Task] = set()
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is not None and flight.get_loop() is asyncio.get_running_loop():
+            self.metrics.coalesced += 1
+        else:
+            flight = self._start(key, load)
+        return await asyncio.shield(flight)
+
+    def refresh(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._flights:
+            return
+
+        self.metrics.refreshes += 1
+        refresh = self._start(key, load)
+        refresh.add_done_callback(log_failed_refresh)
+        self._track(refresh)
+
+    def _start(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        flight = asyncio.ensure_future(self._load(key, load))
+        flight.add_done_callback(retrieve_exception)
+        self._flights[key] = flight
+        self.metrics.loads += 1
+        return flight
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        loading = asyncio.ensure_future(load())
+        loading.add_done_callback(retrieve_exception)
+        self._track(loading)
+        try:
+            await asyncio.wait({loading}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            loading.cancel()
+            raise
+        finally:
+            if self._flights.get(key) is asyncio.current_task():
+                del self._flights[key]
+
+        if not loading.done():
+            loading.cancel()
+            self.metrics.timeouts += 1
+            raise asyncio.TimeoutError
+        return loading.result()
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def cancel_pending(self) -> None:
+        loop = asyncio.get_running_loop()
+        pending = [task for task in self._pending if task.get_loop() is loop]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def forget(self) -> None:
+        self._flights.clear()
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "loads": self.metrics.loads,
+            "coalesced": self.metrics.coalesced,
+            "refreshes": self.metrics.refreshes,
+            "timeouts": self.metrics.timeouts,
+        }
+
+
+def retrieve_exception(flight: asyncio.Task) -> None:
+    if not flight.cancelled():
+        flight.exception()
+
+
+def log_failed_refresh(refresh: asyncio.Task) -> None:
+    if not refresh.cancelled() and refresh.exception() is not None:
+        logger.warning("Background refresh failed", error=str(refresh.exception()))
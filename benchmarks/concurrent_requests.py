@@ -0,0 +1,54 @@
+"""
+Throughput of concurrent GET requests against a running eMenu instance.
+
+Start the app with a single worker (uvicorn app.main:app --workers 1) and run:
+    python -m benchmarks.concurrent_requests --url http://localhost:8000/api/menu/
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def worker(
+    client: httpx.AsyncClient, url: str, requests: int, latencies: list[float]
+) -> None:
+    for _ in range(requests):
+        started = time.perf_counter()
+        res = await client.get(url)
+        res.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(url: str, concurrency: int, requests: int) -> None:
+    latencies: list[float] = []
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        await client.get(url)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[
+                worker(client, url, requests // concurrency, latencies)
+                for _ in range(concurrency)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"requests:    {len(latencies)}")
+    print(f"concurrency: {concurrency}")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"p50:         {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"p99:         {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000/api/menu/")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.requests))
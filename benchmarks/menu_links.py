@@ -0,0 +1,109 @@
+"""
+Latency of adding and removing a position on menus of growing size.
+
+Seeds the configured database (DATABASE) with one menu per size, calls the admin
+endpoints in-process and removes the seeded rows afterwards:
+    python -m benchmarks.menu_links --sizes 10 1000 10000
+
+Only the membership check is independent of the menu size. Both endpoints
+respond with the whole menu and rebuild its snapshot, so they stay linear in
+the number of positions.
+"""
+
+import argparse
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.api.utils import create_access_token, menu_contains_position
+from app.db import get_async_session_constructor, get_session
+from app.main import app
+from app.models.menu import Menu, MenuMenuPosition, MenuPosition
+from app.settings import settings
+
+PREFIX = "benchmark_menu_links"
+
+
+def seed_menu(db: Session, size: int) -> tuple[int, int]:
+    menu = Menu(name=f"{PREFIX}_{size}")
+    db.add(menu)
+    db.flush()
+
+    position_ids = db.scalars(
+        insert(MenuPosition).returning(MenuPosition.id, sort_by_parameter_order=True),
+        [
+            {"name": f"{PREFIX}_{size}_{i}", "price": 10.0, "preparation_time": 15}
+            for i in range(size + 1)
+        ],
+    ).all()
+    *linked, extra = position_ids
+    if linked:
+        db.execute(
+            insert(MenuMenuPosition),
+            [{"menu_id": menu.id, "menu_position_id": i} for i in linked],
+        )
+    db.commit()
+    return menu.id, extra
+
+
+def remove_seeded_rows(db: Session) -> None:
+    menus = select(Menu.id).where(Menu.name.startswith(PREFIX))
+    db.execute(delete(MenuMenuPosition).where(MenuMenuPosition.c.menu_id.in_(menus)))
+    db.execute(delete(Menu).where(Menu.name.startswith(PREFIX)))
+    db.execute(delete(MenuPosition).where(MenuPosition.name.startswith(PREFIX)))
+    db.commit()
+
+
+async def time_membership_check(menu_id: int, position_id: int, repeat: int) -> float:
+    samples = []
+    async with get_async_session_constructor(settings.database)() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await menu_contains_position(db, menu_id, position_id)
+            samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def time_request(client: TestClient, url: str) -> float:
+    started = time.perf_counter()
+    client.post(url).raise_for_status()
+    return time.perf_counter() - started
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    token = create_access_token(data={"sub": "benchmark"})
+    headers = {"Authorization": f"Bearer {token}"}
+    db = get_session(settings.database)
+    remove_seeded_rows(db)
+    try:
+        with TestClient(app, headers=headers) as client:
+            print(f"{'positions':>10} {'check':>10} {'add':>10} {'remove':>10}")
+            for size in sizes:
+                menu_id, position_id = seed_menu(db, size)
+                url = f"/api/admin/menu/{menu_id}/%s/{position_id}"
+                added, removed = [], []
+                for _ in range(repeat):
+                    added.append(time_request(client, url % "add_position"))
+                    removed.append(time_request(client, url % "remove_position"))
+                check = client.portal.call(
+                    time_membership_check, menu_id, position_id, repeat
+                )
+                print(
+                    f"{size:>10} {check * 1000:>8.2f}ms"
+                    f" {statistics.median(added) * 1000:>8.2f}ms"
+                    f" {statistics.median(removed) * 1000:>8.2f}ms"
+                )
+    finally:
+        remove_seeded_rows(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,79 @@
+"""
+Serialization cost of a single menu with 1,000 positions, without the database.
+
+    python -m benchmarks.serialization
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+from app.api.serialization import dump_menu
+from app.models.menu import Menu, MenuPosition
+from app.schemas.menu import MenuSchema
+from app.settings import settings
+
+MENU_ADAPTER = TypeAdapter(MenuSchema)
+
+
+def build_menu(positions: int) -> Menu:
+    now = datetime.now()
+    return Menu(
+        id=1,
+        name="menu",
+        created_at=now,
+        updated_at=now,
+        positions=[
+            MenuPosition(
+                id=i,
+                name=f"position_{i}",
+                price=10.5,
+                description="Some fairly long description of the dish",
+                preparation_time=15,
+                is_vegan=i % 2 == 0,
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(positions)
+        ],
+    )
+
+
+def response_model_path(menu: Menu) -> bytes:
+    validated = MENU_ADAPTER.validate_python(menu, from_attributes=True)
+    content = MENU_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def update_table_path(menu: Menu) -> bytes:
+    content = MenuSchema.from_orm(menu).model_dump()
+    validated = MENU_ADAPTER.validate_python(content)
+    content = MENU_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def validated_path(menu: Menu) -> bytes:
+    settings.fast_json_responses = False
+    return dump_menu(menu)
+
+
+def trusted_path(menu: Menu) -> bytes:
+    settings.fast_json_responses = True
+    return dump_menu(menu)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    menu = build_menu(args.positions)
+    assert json.loads(validated_path(menu)) == json.loads(trusted_path(menu))
+
+    for path in [update_table_path, response_model_path, validated_path, trusted_path]:
+        seconds = min(timeit.repeat(lambda: path(menu), number=args.repeat, repeat=3))
+        print(f"{path.__name__:20} {seconds / args.repeat * 1000:8.3f} ms")
@@ -4,21 +4,23 @@ from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.api.utils import create_access_token
-from app.db import Base
+from app.db import Base, get_async_engine
 from app.main import app
 from app.models.menu import Menu, MenuPosition
 from app.models.user import User
 from app.settings import settings
+from app.utils.cache import menu_cache
 
 
 @pytest.fixture(autouse=True)
 def db_init(engine):
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    menu_cache.clear()
     session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     session().add(User(id=uuid.uuid4(), login="test", password="test"))
 
@@ -32,6 +34,11 @@ def admin_cli():
         yield client
 
 
+@pytest.fixture
+def without_changes_listener(monkeypatch):
+    monkeypatch.setattr(settings, "menu_changes_listener_enabled", False)
+
+
 @pytest.fixture(scope="module")
 def engine():
     engine = create_engine(settings.database.get_secret_value())
@@ -39,6 +46,19 @@ def engine():
     return engine
 
 
+@pytest.fixture
+def executed_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    async_engine = get_async_engine(settings.database).sync_engine
+    event.listen(async_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(async_engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture
 def db_session(engine):
     local_session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
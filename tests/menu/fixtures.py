@@ -19,3 +19,63 @@ def hundred_menus(db_api, json_basic_menu):
         json_basic_menu["name"] = json_basic_menu["name"] + str(i)
         db_api.add(Menu(**json_basic_menu))
     db_api.commit()
+
+
+@pytest.fixture
+def five_hundred_menus_with_positions(db_api, json_basic_menu_position):
+    positions = [
+        MenuPosition(**json_basic_menu_position | {"name": f"position_{i}"})
+        for i in range(3)
+    ]
+    for i in range(500):
+        db_api.add(Menu(name=f"menu_{i}", positions=positions))
+    db_api.commit()
+
+
+@pytest.fixture
+def menu_positions_for_search(db_api):
+    positions = [
+        MenuPosition(
+            name="Tomato soup",
+            description="Creamy soup with basil",
+            price=12.0,
+            preparation_time=10,
+            is_vegan=True,
+        ),
+        MenuPosition(
+            name="Pork chop",
+            description="Served with tomato salad",
+            price=35.0,
+            preparation_time=25,
+            is_vegan=False,
+        ),
+        MenuPosition(
+            name="Spicy tomato pasta",
+            description="Pasta with chili and garlic",
+            price=28.0,
+            preparation_time=15,
+            is_vegan=True,
+        ),
+        MenuPosition(
+            name="Cheesecake",
+            description="Baked cheesecake",
+            price=15.0,
+            preparation_time=5,
+            is_vegan=False,
+        ),
+    ]
+    db_api.add_all(positions)
+    db_api.commit()
+    return positions
+
+
+@pytest.fixture
+def fifty_tomato_positions(db_api, json_basic_menu_position):
+    for i in range(50):
+        db_api.add(
+            MenuPosition(
+                **json_basic_menu_position
+                | {"name": f"tomato_{i}", "description": "tomato " * (i % 5)}
+            )
+        )
+    db_api.commit()
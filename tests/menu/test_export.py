@@ -0,0 +1,100 @@
+import json
+import subprocess
+import sys
+from http import HTTPStatus
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import app
+from app.models.menu import Menu
+from tests.menu.fixtures import hundred_menu_positions
+
+EXPORT_RSS_CEILING_MB = 64
+
+EXPORT_RSS_SCRIPT = """
+import asyncio
+import resource
+
+from app.api.export import stream_menu_positions
+
+
+async def export():
+    lines = 0
+    async for chunk in stream_menu_positions():
+        lines += chunk.count(b"\\n")
+    return lines
+
+
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+lines = asyncio.run(export())
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(lines, (after - before) // 1024)
+"""
+
+
+def when_user_exports(test_client, url):
+    res = test_client.get(url)
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.headers["content-type"] == "application/x-ndjson"
+    return res.content.splitlines()
+
+
+def test_export_menus_should_return_one_menu_per_line(
+    admin_cli, db_api, with_menu_position
+):
+    for i in range(3):
+        db_api.add(Menu(name=f"menu_{i}", positions=[with_menu_position]))
+    db_api.commit()
+
+    lines = when_user_exports(admin_cli, "/api/admin/menu/export")
+
+    assert len(lines) == 3
+    for line in lines:
+        menu = json.loads(line)
+        assert line == admin_cli.get(f"/api/menu/{menu['id']}").content
+
+
+def test_export_menu_positions_should_return_one_position_per_line(
+    admin_cli, hundred_menu_positions
+):
+    lines = when_user_exports(admin_cli, "/api/admin/menu_position/export")
+
+    positions = [json.loads(line) for line in lines]
+    assert positions == admin_cli.get("/api/admin/menu_position").json()
+
+
+def test_export_of_empty_catalog_should_return_empty_body(admin_cli):
+    assert when_user_exports(admin_cli, "/api/admin/menu/export") == []
+
+
+def test_export_should_require_authentication():
+    with TestClient(app) as client:
+        res = client.get("/api/admin/menu_position/export")
+    assert res.status_code == HTTPStatus.UNAUTHORIZED, res.text
+
+
+def test_export_menu_positions_should_keep_memory_flat(db_api):
+    db_api.execute(
+        text(
+            "INSERT INTO menu_position "
+            "(name, price, description, preparation_time, is_vegan, "
+            "created_at, updated_at) "
+            "SELECT 'position_' || i, 10.5, 'description ' || i, 10, false, "
+            "now(), now() FROM generate_series(1, 200000) AS i"
+        )
+    )
+    db_api.commit()
+
+    result = subprocess.run(
+        [sys.executable, "-c", EXPORT_RSS_SCRIPT],
+        cwd=Path(__file__).parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines, rss_growth_mb = map(int, result.stdout.split()[-2:])
+
+    assert lines == 200000
+    assert rss_growth_mb < EXPORT_RSS_CEILING_MB
@@ -4,6 +4,7 @@ from http import HTTPStatus
 
 import pytest
 
+from app.api.pagination import encode_cursor
 from app.models.menu import Menu, MenuMenuPosition, MenuPosition
 from tests.menu.fixtures import hundred_menu_positions, hundred_menus
 
@@ -39,6 +40,19 @@ def test_create_new_menu_should_create_new_record_in_db(
     assert menu is not None
 
 
+def test_create_menu_should_ignore_out_of_range_position_ids(
+    admin_cli, db_api, with_menu_position
+):
+    res = admin_cli.post(
+        "/api/admin/menu",
+        json={"name": "new_menu", "positions": [with_menu_position.id, 2**31]},
+    )
+    assert res.status_code == HTTPStatus.CREATED, res.text
+
+    menu = db_api.get(Menu, res.json()["id"])
+    assert [position.id for position in menu.positions] == [with_menu_position.id]
+
+
 def test_create_new_menu_positions_with_menu(admin_cli, with_menu):
     res = admin_cli.post("/api/admin/menu", json={"name": "new_menu"})
     assert res.status_code == HTTPStatus.CREATED, res.text
@@ -85,6 +99,36 @@ def test_patch_menu_should_update_record_in_db(admin_cli, db_api, json_basic_men
     assert menu.name == "new_name"
 
 
+def test_update_menu_should_replace_positions_with_requested_ones(
+    admin_cli, db_api, hundred_menu_positions
+):
+    res = admin_cli.post("/api/admin/menu", json={"name": "menu", "positions": [1, 2]})
+    menu_id = res.json()["id"]
+
+    res = admin_cli.put(
+        f"/api/admin/menu/{menu_id}",
+        json={"name": "menu", "positions": [2, 3, 3, 999]},
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert [position["id"] for position in res.json()["positions"]] == [2, 3]
+
+    db_api.expire_all()
+    menu = db_api.get(Menu, menu_id)
+    assert [position.id for position in menu.positions] == [2, 3]
+    assert menu.positions_count == 2
+
+
+def test_update_not_existing_menu_should_not_add_positions(
+    admin_cli, db_api, with_menu_position
+):
+    res = admin_cli.put(
+        "/api/admin/menu/999",
+        json={"name": "menu", "positions": [with_menu_position.id]},
+    )
+    assert res.status_code == HTTPStatus.NOT_FOUND, res.text
+    assert db_api.query(MenuMenuPosition).count() == 0
+
+
 def test_delete_menu_should_return_ok_message(admin_cli, json_basic_menu):
     res = admin_cli.post("/api/admin/menu", json=json_basic_menu)
     assert res.status_code == HTTPStatus.CREATED, res.text
@@ -294,6 +338,29 @@ def test_get_menus_filtered_by_name_should_return_filtered_list(admin_cli, db_ap
     assert menus[1]["name"] == "some"
 
 
+def test_get_menus_filtered_by_name_should_ignore_case(admin_cli, db_api):
+    for name in ["Some", "RANSOM", "names"]:
+        db_api.add(Menu(name=name))
+    db_api.commit()
+
+    res = admin_cli.get("/api/menu", params={"name": "sOm"})
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    menus = res.json()
+    assert [menu["name"] for menu in menus] == ["RANSOM", "Some"]
+
+
+def test_get_menus_filtered_by_name_should_match_wildcards_literally(admin_cli, db_api):
+    for name in ["100% vegan", "1000 vegan", "a_b", "axb", "back\\slash"]:
+        db_api.add(Menu(name=name))
+    db_api.commit()
+
+    for name, expected in [("0%", "100% vegan"), ("_", "a_b"), ("\\", "back\\slash")]:
+        res = admin_cli.get("/api/menu", params={"name": name})
+        assert res.status_code == HTTPStatus.OK, res.text
+        assert [menu["name"] for menu in res.json()] == [expected]
+
+
 def test_get_menus_filtered_by_created_after_should_return_filtered_list(
     admin_cli, db_api, with_menus_with_different_dates
 ):
@@ -313,6 +380,8 @@ def test_get_menus_filtered_by_created_after_should_return_filtered_list(
         ({"created_after": "2022-01-01"}, ["menu_1", "menu_2"]),
         ({"updated_before": "2022-01-01"}, ["menu_0", "menu_1"]),
         ({"updated_after": "2022-01-01T00:00:00"}, ["menu_1", "menu_2"]),
+        ({"created_before": "2022-01-01T01:00:00+02:00"}, ["menu_0"]),
+        ({"updated_after": "2021-12-31T23:00:00-01:00"}, ["menu_1", "menu_2"]),
         (
             {
                 "created_after": "2021-12-31T00:00:00",
@@ -348,3 +417,111 @@ def test_get_filtered_menus_should_return_filtered_list(
     assert len(menus) == len(expected_names)
     for i, menu in enumerate(menus):
         assert menu["name"] == expected_names[i]
+
+
+def when_user_gets_all_menu_pages(test_client, params):
+    pages = []
+    while True:
+        res = test_client.get("/api/menu", params=params)
+        assert res.status_code == HTTPStatus.OK, res.text
+        pages.append(res.json())
+        if "X-Next-Cursor" not in res.headers:
+            return pages
+        params = params | {"cursor": res.headers["X-Next-Cursor"]}
+
+
+def test_get_menus_should_be_paginated(admin_cli, hundred_menus):
+    pages = when_user_gets_all_menu_pages(admin_cli, {"limit": 30})
+
+    assert [len(page) for page in pages] == [30, 30, 30, 10]
+    names = [menu["name"] for page in pages for menu in page]
+    assert names == sorted(names)
+    assert len(set(names)) == 100
+
+
+def test_get_menus_should_not_return_cursor_on_last_page(admin_cli, hundred_menus):
+    res = admin_cli.get("/api/menu", params={"limit": 101})
+    assert len(res.json()) == 100
+    assert "X-Next-Cursor" not in res.headers
+
+
+def test_get_menus_pagination_should_keep_filters(admin_cli, hundred_menus, db_api):
+    for name in ["filtered_a", "filtered_b", "filtered_c"]:
+        db_api.add(Menu(name=name))
+    db_api.commit()
+
+    pages = when_user_gets_all_menu_pages(admin_cli, {"limit": 2, "name": "FILTERED"})
+
+    names = [menu["name"] for page in pages for menu in page]
+    assert names == ["filtered_a", "filtered_b", "filtered_c"]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eyJzb3J0IjoieCJ9"])
+def test_get_menus_with_invalid_cursor_should_return_bad_request(admin_cli, cursor):
+    res = admin_cli.get("/api/menu", params={"cursor": cursor})
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+
+
+@pytest.mark.parametrize(
+    "sortby, values",
+    [
+        ("name", [{"x": 1}, 1]),
+        ("name", ["menu", 2**31]),
+        ("name", ["menu\x00", 1]),
+        ("positions_count", ["many", 1]),
+        ("positions_count", [1.5, 1]),
+        ("positions_count", [True, 1]),
+    ],
+)
+def test_get_menus_with_cursor_values_of_wrong_type_should_return_bad_request(
+    admin_cli, with_menu, sortby, values
+):
+    params = {"sortby": sortby, "cursor": encode_cursor(sortby, values)}
+    res = admin_cli.get("/api/menu", params=params)
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+
+
+def test_get_menus_sorted_by_positions_count_should_return_smallest_first(
+    admin_cli, db_api, hundred_menu_positions
+):
+    positions = db_api.query(MenuPosition).order_by(MenuPosition.id).all()
+    for name, size in [("big", 5), ("empty", 0), ("small", 1)]:
+        db_api.add(Menu(name=name, positions=positions[:size]))
+    db_api.commit()
+
+    res = admin_cli.get("/api/menu", params={"sortby": "positions_count"})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert [menu["name"] for menu in res.json()] == ["empty", "small", "big"]
+
+
+def test_positions_count_should_follow_menu_changes(
+    admin_cli, db_api, with_menu_with_position, hundred_menu_positions
+):
+    menu_id = with_menu_with_position.id
+    position_id = with_menu_with_position.positions[0].id
+
+    admin_cli.post(f"/api/admin/menu/{menu_id}/add_position/2")
+    admin_cli.post(f"/api/admin/menu/{menu_id}/add_position/3")
+    admin_cli.post(f"/api/admin/menu/{menu_id}/remove_position/2")
+    admin_cli.delete(f"/api/admin/menu_position/{position_id}")
+
+    db_api.expire_all()
+    assert db_api.get(Menu, menu_id).positions_count == 1
+
+    admin_cli.put(
+        f"/api/admin/menu/{menu_id}", json={"name": "menu", "positions": [4, 5, 6]}
+    )
+
+    db_api.expire_all()
+    assert db_api.get(Menu, menu_id).positions_count == 3
+
+
+def test_get_menus_sorted_by_positions_count_should_be_paginated(
+    admin_cli, db_api, hundred_menus
+):
+    pages = when_user_gets_all_menu_pages(
+        admin_cli, {"sortby": "positions_count", "limit": 40}
+    )
+
+    assert [len(page) for page in pages] == [40, 40, 20]
+    assert len({menu["id"] for page in pages for menu in page}) == 100
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+from app.api.menu import MENU_BATCH_MAX_SIZE
+from app.models.menu import Menu
+from app.utils.vars import MAX_INT_64
+
+
+def when_user_gets_menus_batch(test_client, ids, **kwargs):
+    return test_client.get("/api/menu/batch", params={"ids": ids}, **kwargs)
+
+
+def test_get_menus_batch_should_return_menus_keyed_by_id(
+    admin_cli, db_api, with_menu_with_position
+):
+    other_menu = Menu(name="other_menu")
+    db_api.add(other_menu)
+    db_api.commit()
+
+    res = when_user_gets_menus_batch(
+        admin_cli, f"{with_menu_with_position.id},{other_menu.id}"
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    menus = res.json()
+    assert list(menus) == [str(with_menu_with_position.id), str(other_menu.id)]
+    assert len(menus[str(with_menu_with_position.id)]["positions"]) == 1
+    for menu_id, menu in menus.items():
+        assert menu == admin_cli.get(f"/api/menu/{menu_id}").json()
+
+
+def test_get_menus_batch_should_mark_missing_menus_with_null(admin_cli, with_menu):
+    res = when_user_gets_menus_batch(admin_cli, f"{with_menu.id},999,{MAX_INT_64 + 1}")
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    menus = res.json()
+    assert menus[str(with_menu.id)]["name"] == with_menu.name
+    assert menus["999"] is None
+    assert menus[str(MAX_INT_64 + 1)] is None
+
+
+def test_get_menus_batch_should_skip_duplicated_ids(admin_cli, with_menu):
+    res = when_user_gets_menus_batch(admin_cli, f"{with_menu.id}, {with_menu.id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert list(res.json()) == [str(with_menu.id)]
+
+
+def test_get_menus_batch_should_reflect_changes(admin_cli, with_menu):
+    when_user_gets_menus_batch(admin_cli, str(with_menu.id))
+
+    admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "renamed"})
+
+    res = when_user_gets_menus_batch(admin_cli, str(with_menu.id))
+    assert res.json()[str(with_menu.id)]["name"] == "renamed"
+
+
+def test_get_menus_batch_should_return_not_modified_for_matching_etag(
+    admin_cli, with_menu
+):
+    res = when_user_gets_menus_batch(admin_cli, f"{with_menu.id},999")
+    etag = res.headers["ETag"]
+
+    res = when_user_gets_menus_batch(
+        admin_cli, f"{with_menu.id},999", headers={"If-None-Match": etag}
+    )
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+
+    admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "renamed"})
+    res = when_user_gets_menus_batch(
+        admin_cli, f"{with_menu.id},999", headers={"If-None-Match": etag}
+    )
+    assert res.status_code == HTTPStatus.OK
+
+
+def test_get_menus_batch_with_too_many_ids_should_return_bad_request(admin_cli):
+    ids = ",".join(str(menu_id) for menu_id in range(1, MENU_BATCH_MAX_SIZE + 2))
+
+    res = when_user_gets_menus_batch(admin_cli, ids)
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+
+
+def test_get_menus_batch_with_invalid_ids_should_return_bad_request(admin_cli):
+    for ids in ["", "1,,2", "1,a", "-1", "1_0"]:
+        res = when_user_gets_menus_batch(admin_cli, ids)
+        assert res.status_code == HTTPStatus.BAD_REQUEST, ids
@@ -0,0 +1,243 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import text
+
+from app.models.menu import Menu, MenuPosition
+from app.utils.cache import menu_cache, menu_loads
+
+
+def when_user_gets_menu(test_client, menu_id):
+    res = test_client.get(f"/api/menu/{menu_id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+    return res.json()
+
+
+def when_user_gets_menus(test_client):
+    res = test_client.get("/api/menu")
+    assert res.status_code == HTTPStatus.OK, res.text
+    return res.json()
+
+
+def given_two_menus_with_own_positions(db_api, json_basic_menu_position):
+    menus = [
+        Menu(
+            name=f"menu_{i}",
+            positions=[
+                MenuPosition(**json_basic_menu_position | {"name": f"position_{i}"})
+            ],
+        )
+        for i in range(2)
+    ]
+    db_api.add_all(menus)
+    db_api.commit()
+    return menus
+
+
+def test_get_menu_should_be_served_from_cache(
+    admin_cli, executed_statements, with_menu
+):
+    first = when_user_gets_menu(admin_cli, with_menu.id)
+
+    executed_statements.clear()
+    second = when_user_gets_menu(admin_cli, with_menu.id)
+
+    assert first == second
+    assert executed_statements == []
+
+
+def test_get_menus_should_cache_next_cursor_header(admin_cli, db_api):
+    for i in range(3):
+        db_api.add(Menu(name=f"menu_{i}"))
+    db_api.commit()
+
+    first = admin_cli.get("/api/menu", params={"limit": 2})
+    second = admin_cli.get("/api/menu", params={"limit": 2})
+
+    assert first.json() == second.json()
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+
+def test_patch_menu_should_invalidate_cached_menu(admin_cli, with_menu):
+    when_user_gets_menu(admin_cli, with_menu.id)
+    when_user_gets_menus(admin_cli)
+
+    res = admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "renamed"})
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    assert when_user_gets_menu(admin_cli, with_menu.id)["name"] == "renamed"
+    assert [menu["name"] for menu in when_user_gets_menus(admin_cli)] == ["renamed"]
+
+
+def test_put_menu_should_invalidate_cached_menu(admin_cli, with_menu):
+    when_user_gets_menu(admin_cli, with_menu.id)
+    when_user_gets_menus(admin_cli)
+
+    res = admin_cli.put(
+        f"/api/admin/menu/{with_menu.id}", json={"name": "renamed", "positions": []}
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    assert when_user_gets_menu(admin_cli, with_menu.id)["name"] == "renamed"
+    assert [menu["name"] for menu in when_user_gets_menus(admin_cli)] == ["renamed"]
+
+
+def test_create_menu_should_invalidate_cached_menu_list(admin_cli, with_menu):
+    when_user_gets_menus(admin_cli)
+
+    res = admin_cli.post("/api/admin/menu", json={"name": "new_menu"})
+    assert res.status_code == HTTPStatus.CREATED, res.text
+
+    assert len(when_user_gets_menus(admin_cli)) == 2
+
+
+def test_delete_menu_should_invalidate_cached_menu(admin_cli, with_menu):
+    when_user_gets_menu(admin_cli, with_menu.id)
+
+    res = admin_cli.delete(f"/api/admin/menu/{with_menu.id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    res = admin_cli.get(f"/api/menu/{with_menu.id}")
+    assert res.status_code == HTTPStatus.NOT_FOUND, res.text
+
+
+def test_add_and_remove_position_should_invalidate_cached_menu(
+    admin_cli, with_menu, with_menu_position
+):
+    when_user_gets_menu(admin_cli, with_menu.id)
+
+    url = f"/api/admin/menu/{with_menu.id}/add_position/{with_menu_position.id}"
+    assert admin_cli.post(url).status_code == HTTPStatus.OK
+    assert len(when_user_gets_menu(admin_cli, with_menu.id)["positions"]) == 1
+
+    url = f"/api/admin/menu/{with_menu.id}/remove_position/{with_menu_position.id}"
+    assert admin_cli.post(url).status_code == HTTPStatus.OK
+    assert len(when_user_gets_menu(admin_cli, with_menu.id)["positions"]) == 0
+
+
+def test_patch_position_should_invalidate_only_menus_containing_it(
+    admin_cli, db_api, executed_statements, json_basic_menu_position
+):
+    menu, other_menu = given_two_menus_with_own_positions(
+        db_api, json_basic_menu_position
+    )
+    when_user_gets_menu(admin_cli, menu.id)
+    when_user_gets_menu(admin_cli, other_menu.id)
+
+    res = admin_cli.patch(
+        f"/api/admin/menu_position/{menu.positions[0].id}", json={"price": 99.0}
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    executed_statements.clear()
+    when_user_gets_menu(admin_cli, other_menu.id)
+    assert executed_statements == []
+
+    assert when_user_gets_menu(admin_cli, menu.id)["positions"][0]["price"] == 99.0
+
+
+def test_put_position_should_invalidate_menus_it_was_moved_to(
+    admin_cli, db_api, json_basic_menu_position
+):
+    menu, other_menu = given_two_menus_with_own_positions(
+        db_api, json_basic_menu_position
+    )
+    when_user_gets_menu(admin_cli, menu.id)
+    when_user_gets_menu(admin_cli, other_menu.id)
+
+    res = admin_cli.put(
+        f"/api/admin/menu_position/{menu.positions[0].id}",
+        json=json_basic_menu_position
+        | {"name": "moved", "is_vegan": False, "menus": [other_menu.id]},
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    assert when_user_gets_menu(admin_cli, menu.id)["positions"] == []
+    positions = when_user_gets_menu(admin_cli, other_menu.id)["positions"]
+    assert {position["name"] for position in positions} == {"moved", "position_1"}
+
+
+def test_delete_position_should_invalidate_menus_containing_it(
+    admin_cli, db_api, json_basic_menu_position
+):
+    menu, _ = given_two_menus_with_own_positions(db_api, json_basic_menu_position)
+    when_user_gets_menu(admin_cli, menu.id)
+
+    res = admin_cli.delete(f"/api/admin/menu_position/{menu.positions[0].id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    assert when_user_gets_menu(admin_cli, menu.id)["positions"] == []
+
+
+def test_failed_mutation_should_not_invalidate_cache(
+    admin_cli, executed_statements, with_menu
+):
+    when_user_gets_menus(admin_cli)
+
+    res = admin_cli.post("/api/admin/menu", json={"name": with_menu.name})
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+
+    executed_statements.clear()
+    when_user_gets_menus(admin_cli)
+    assert executed_statements == []
+
+
+def test_cache_metrics_should_count_hits_and_misses(admin_cli, with_menu):
+    res = admin_cli.get("/api/admin/metrics/cache")
+    assert res.status_code == HTTPStatus.OK, res.text
+    before = res.json()["menu"]
+
+    for _ in range(3):
+        when_user_gets_menu(admin_cli, with_menu.id)
+
+    after = admin_cli.get("/api/admin/metrics/cache").json()["menu"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 2
+    assert after["size"] == 1
+
+
+def given_stale_menus_cache(monkeypatch, admin_cli):
+    monkeypatch.setattr(menu_cache, "ttl", 0)
+    monkeypatch.setattr(menu_cache, "stale_ttl", 60)
+    when_user_gets_menus(admin_cli)
+
+
+def test_get_menus_should_return_cache_control_headers(admin_cli, with_menu):
+    res = admin_cli.get("/api/menu")
+    assert res.headers["Cache-Control"] == "max-age=60, stale-while-revalidate=30"
+
+    res = admin_cli.get("/api/menu")
+    assert res.headers["Cache-Control"] == "max-age=60, stale-while-revalidate=30"
+    assert int(res.headers["Age"]) >= 0
+
+
+@pytest.mark.usefixtures("without_changes_listener")
+def test_get_menus_should_serve_stale_list_and_refresh_it_in_background(
+    admin_cli, db_api, monkeypatch, with_menu
+):
+    given_stale_menus_cache(monkeypatch, admin_cli)
+    db_api.execute(text("UPDATE menu SET name = 'renamed'"))
+    db_api.commit()
+    refreshes = menu_loads.status()["refreshes"]
+
+    assert [menu["name"] for menu in when_user_gets_menus(admin_cli)] == ["test_menu"]
+
+    deadline = time.monotonic() + 5
+    while menu_loads.status()["in_flight"]:
+        assert time.monotonic() < deadline, "refresh did not finish in time"
+        time.sleep(0.01)
+    assert [menu["name"] for menu in when_user_gets_menus(admin_cli)] == ["renamed"]
+    assert menu_loads.status()["refreshes"] > refreshes
+
+
+@pytest.mark.usefixtures("without_changes_listener")
+def test_get_menus_should_not_serve_stale_list_after_admin_change(
+    admin_cli, monkeypatch, with_menu
+):
+    given_stale_menus_cache(monkeypatch, admin_cli)
+
+    res = admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "renamed"})
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    assert [menu["name"] for menu in when_user_gets_menus(admin_cli)] == ["renamed"]
@@ -0,0 +1,146 @@
+import base64
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import text
+
+SINCE_BEGINNING = "2000-01-01T00:00:00"
+
+
+def encode_token(value):
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def when_user_gets_changes(test_client, since):
+    res = test_client.get("/api/menu/changes", params={"since": since})
+    assert res.status_code == HTTPStatus.OK, res.text
+    return res.json()
+
+
+def given_watermark(test_client):
+    return when_user_gets_changes(test_client, SINCE_BEGINNING)["watermark"]
+
+
+def test_get_changes_since_timestamp_should_return_existing_rows(
+    admin_cli, with_menu_with_position
+):
+    changes = when_user_gets_changes(admin_cli, SINCE_BEGINNING)
+
+    assert [menu["id"] for menu in changes["menus"]] == [with_menu_with_position.id]
+    assert len(changes["menus"][0]["positions"]) == 1
+    assert len(changes["positions"]) == 1
+    assert changes["watermark"]
+
+
+def test_get_changes_since_watermark_should_return_nothing_without_writes(
+    admin_cli, with_menu_with_position
+):
+    changes = when_user_gets_changes(admin_cli, given_watermark(admin_cli))
+
+    assert changes["menus"] == []
+    assert changes["positions"] == []
+    assert changes["deleted_menus"] == []
+    assert changes["deleted_positions"] == []
+
+
+def test_get_changes_should_return_updated_menu(admin_cli, with_menu, db_api):
+    watermark = given_watermark(admin_cli)
+
+    admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "renamed"})
+
+    changes = when_user_gets_changes(admin_cli, watermark)
+    assert [menu["name"] for menu in changes["menus"]] == ["renamed"]
+
+
+def test_get_changes_should_return_menu_when_position_is_attached(
+    admin_cli, with_menu, with_menu_position
+):
+    watermark = given_watermark(admin_cli)
+
+    admin_cli.post(
+        f"/api/admin/menu/{with_menu.id}/add_position/{with_menu_position.id}"
+    )
+
+    changes = when_user_gets_changes(admin_cli, watermark)
+    assert [menu["id"] for menu in changes["menus"]] == [with_menu.id]
+    assert changes["positions"] == []
+
+
+def test_get_changes_should_return_updated_position_and_its_menus(
+    admin_cli, with_menu_with_position
+):
+    position = with_menu_with_position.positions[0]
+    watermark = given_watermark(admin_cli)
+
+    admin_cli.patch(f"/api/admin/menu_position/{position.id}", json={"price": 99.0})
+
+    changes = when_user_gets_changes(admin_cli, watermark)
+    assert [position["price"] for position in changes["positions"]] == [99.0]
+    assert changes["menus"][0]["positions"][0]["price"] == 99.0
+
+
+def test_get_changes_should_return_deleted_rows(admin_cli, with_menu_with_position):
+    position = with_menu_with_position.positions[0]
+    watermark = given_watermark(admin_cli)
+
+    admin_cli.delete(f"/api/admin/menu_position/{position.id}")
+    admin_cli.delete(f"/api/admin/menu/{with_menu_with_position.id}")
+
+    changes = when_user_gets_changes(admin_cli, watermark)
+    assert changes["menus"] == []
+    assert changes["deleted_menus"] == [with_menu_with_position.id]
+    assert changes["deleted_positions"] == [position.id]
+
+
+def test_get_changes_should_not_skip_rows_of_transactions_in_progress(
+    admin_cli, engine, with_menu
+):
+    with engine.connect() as connection:
+        connection.execute(
+            text("UPDATE menu SET name = 'slow', updated_at = now() WHERE id = :id"),
+            {"id": with_menu.id},
+        )
+
+        changes = when_user_gets_changes(admin_cli, SINCE_BEGINNING)
+        assert [menu["name"] for menu in changes["menus"]] == ["test_menu"]
+        connection.commit()
+
+    changes = when_user_gets_changes(admin_cli, changes["watermark"])
+    assert [menu["name"] for menu in changes["menus"]] == ["slow"]
+
+
+def test_get_changes_should_not_skip_rows_of_transactions_that_read_before_writing(
+    admin_cli, engine, with_menu
+):
+    with engine.connect() as connection:
+        connection.execute(
+            text("SELECT id FROM menu WHERE id = :id"), {"id": with_menu.id}
+        )
+        watermark = given_watermark(admin_cli)
+
+        connection.execute(
+            text("UPDATE menu SET name = 'slow', updated_at = now() WHERE id = :id"),
+            {"id": with_menu.id},
+        )
+        connection.commit()
+
+    changes = when_user_gets_changes(admin_cli, watermark)
+    assert [menu["name"] for menu in changes["menus"]] == ["slow"]
+
+
+def test_get_changes_since_encoded_offset_aware_timestamp_should_return_rows(
+    admin_cli, with_menu_with_position
+):
+    since = encode_token("2000-01-01T00:00:00+02:00")
+
+    changes = when_user_gets_changes(admin_cli, since)
+
+    assert [menu["id"] for menu in changes["menus"]] == [with_menu_with_position.id]
+
+
+@pytest.mark.parametrize(
+    "since", ["invalid", encode_token("\u00b2"), encode_token("9" * 30)]
+)
+def test_get_changes_with_invalid_watermark_should_return_bad_request(admin_cli, since):
+    res = admin_cli.get("/api/menu/changes", params={"since": since})
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
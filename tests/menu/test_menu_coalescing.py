@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import text
+
+from app.utils.cache import menu_loads
+
+CONCURRENT_REQUESTS = 20
+
+pytestmark = pytest.mark.usefixtures("without_changes_listener")
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def locked_snapshots(engine):
+    connection = engine.connect()
+    connection.execute(text("LOCK TABLE menu_snapshot IN ACCESS EXCLUSIVE MODE"))
+    yield connection
+    connection.close()
+
+
+def test_concurrent_get_menu_should_load_menu_once(
+    admin_cli, executed_statements, with_menu_with_position, locked_snapshots
+):
+    url = f"/api/menu/{with_menu_with_position.id}"
+    before = menu_loads.status()
+
+    with ThreadPoolExecutor(CONCURRENT_REQUESTS) as executor:
+        responses = [
+            executor.submit(admin_cli.get, url) for _ in range(CONCURRENT_REQUESTS)
+        ]
+        wait_for(
+            lambda: menu_loads.status()["coalesced"]
+            == before["coalesced"] + CONCURRENT_REQUESTS - 1
+        )
+        locked_snapshots.rollback()
+        responses = [response.result() for response in responses]
+
+    assert {response.status_code for response in responses} == {HTTPStatus.OK}
+    assert len({response.content for response in responses}) == 1
+    assert menu_loads.status()["loads"] == before["loads"] + 1
+    assert len(executed_statements) == 4
+
+
+def test_concurrent_get_not_existing_menu_should_return_not_found(
+    admin_cli, locked_snapshots
+):
+    with ThreadPoolExecutor(2) as executor:
+        responses = [executor.submit(admin_cli.get, "/api/menu/999") for _ in range(2)]
+        wait_for(lambda: menu_loads.status()["in_flight"] == 1)
+        locked_snapshots.rollback()
+        responses = [response.result() for response in responses]
+
+    assert [response.status_code for response in responses] == [
+        HTTPStatus.NOT_FOUND
+    ] * 2
+
+
+def test_get_menu_should_fail_when_load_times_out(
+    admin_cli, monkeypatch, with_menu, locked_snapshots
+):
+    monkeypatch.setattr(menu_loads, "timeout", 0.2)
+
+    res = admin_cli.get(f"/api/menu/{with_menu.id}")
+    locked_snapshots.rollback()
+
+    assert res.status_code == HTTPStatus.SERVICE_UNAVAILABLE, res.text
+    assert admin_cli.get(f"/api/menu/{with_menu.id}").status_code == HTTPStatus.OK
+
+
+def test_coalescing_metrics_should_be_available_for_admin(admin_cli):
+    res = admin_cli.get("/api/admin/metrics/coalescing")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert set(res.json()["menu"]) == {
+        "in_flight",
+        "loads",
+        "coalesced",
+        "refreshes",
+        "timeouts",
+    }
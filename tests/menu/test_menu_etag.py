@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+from app.models.menu import Menu
+from app.utils.cache import menu_cache
+
+
+def when_user_gets(test_client, url, etag=None, params=None):
+    headers = {"If-None-Match": etag} if etag is not None else {}
+    return test_client.get(url, headers=headers, params=params)
+
+
+def test_get_menu_should_return_etag_and_last_modified(admin_cli, with_menu):
+    res = when_user_gets(admin_cli, f"/api/menu/{with_menu.id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.headers["ETag"].startswith('"')
+    assert res.headers["Last-Modified"].endswith("GMT")
+
+    menu_cache.clear()
+    again = when_user_gets(admin_cli, f"/api/menu/{with_menu.id}")
+    assert again.headers["ETag"] == res.headers["ETag"]
+
+
+def test_get_menu_with_matching_etag_should_return_not_modified(
+    admin_cli, with_menu_with_position
+):
+    url = f"/api/menu/{with_menu_with_position.id}"
+    etag = when_user_gets(admin_cli, url).headers["ETag"]
+
+    res = when_user_gets(admin_cli, url, etag)
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+    assert res.content == b""
+    assert res.headers["ETag"] == etag
+
+    res = when_user_gets(admin_cli, url, f'"other", W/{etag}')
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_get_menu_with_matching_etag_should_not_load_positions(
+    admin_cli, executed_statements, with_menu_with_position
+):
+    url = f"/api/menu/{with_menu_with_position.id}"
+    etag = when_user_gets(admin_cli, url).headers["ETag"]
+
+    menu_cache.clear()
+    executed_statements.clear()
+    res = when_user_gets(admin_cli, url, etag)
+
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+    assert len(executed_statements) == 1
+
+
+def test_get_not_existing_menu_with_etag_should_return_not_found(admin_cli):
+    res = when_user_gets(admin_cli, "/api/menu/123", "*")
+    assert res.status_code == HTTPStatus.NOT_FOUND, res.text
+
+
+def test_menu_etag_should_change_when_menu_is_renamed(admin_cli, with_menu):
+    url = f"/api/menu/{with_menu.id}"
+    etag = when_user_gets(admin_cli, url).headers["ETag"]
+
+    admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "renamed"})
+
+    res = when_user_gets(admin_cli, url, etag)
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.headers["ETag"] != etag
+
+
+def test_menu_etag_should_change_when_positions_change(
+    admin_cli, with_menu, with_menu_position
+):
+    url = f"/api/menu/{with_menu.id}"
+    etags = [when_user_gets(admin_cli, url).headers["ETag"]]
+
+    admin_cli.post(
+        f"/api/admin/menu/{with_menu.id}/add_position/{with_menu_position.id}"
+    )
+    etags.append(when_user_gets(admin_cli, url).headers["ETag"])
+
+    admin_cli.patch(
+        f"/api/admin/menu_position/{with_menu_position.id}", json={"price": 99.0}
+    )
+    etags.append(when_user_gets(admin_cli, url).headers["ETag"])
+
+    admin_cli.post(
+        f"/api/admin/menu/{with_menu.id}/remove_position/{with_menu_position.id}"
+    )
+    etags.append(when_user_gets(admin_cli, url).headers["ETag"])
+
+    assert len(set(etags)) == 4
+    menu_cache.clear()
+    res = when_user_gets(admin_cli, url, etags[-1])
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_get_menus_with_matching_etag_should_return_not_modified(
+    admin_cli, with_menu_with_position
+):
+    etag = when_user_gets(admin_cli, "/api/menu").headers["ETag"]
+
+    menu_cache.clear()
+    res = when_user_gets(admin_cli, "/api/menu", etag)
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+    assert res.headers["ETag"] == etag
+
+
+def test_menus_etag_should_change_when_new_menu_matches_query(admin_cli, db_api):
+    db_api.add(Menu(name="menu_1"))
+    db_api.commit()
+    params = {"name": "menu"}
+    etag = when_user_gets(admin_cli, "/api/menu", params=params).headers["ETag"]
+
+    admin_cli.post("/api/admin/menu", json={"name": "other"})
+    res = when_user_gets(admin_cli, "/api/menu", etag, params)
+    assert res.status_code == HTTPStatus.NOT_MODIFIED
+
+    admin_cli.post("/api/admin/menu", json={"name": "menu_2"})
+    res = when_user_gets(admin_cli, "/api/menu", etag, params)
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert len(res.json()) == 2
+
+
+def test_menus_etag_should_differ_between_sortings(
+    admin_cli, db_api, with_menu_position
+):
+    menus = [Menu(name=name) for name in ["a", "b"]]
+    db_api.add_all(menus)
+    db_api.commit()
+    admin_cli.post(
+        f"/api/admin/menu/{menus[0].id}/add_position/{with_menu_position.id}"
+    )
+
+    by_name = when_user_gets(admin_cli, "/api/menu").headers["ETag"]
+    by_count = when_user_gets(
+        admin_cli, "/api/menu", params={"sortby": "positions_count"}
+    ).headers["ETag"]
+
+    assert by_name != by_count
@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.utils.cache import menu_cache
+
+
+def when_user_gets_menus(test_client, params, **kwargs):
+    res = test_client.get("/api/menu", params=params, **kwargs)
+    assert res.status_code == HTTPStatus.OK, res.text
+    return res
+
+
+def test_get_menus_should_return_only_requested_fields(
+    admin_cli, with_menu_with_position
+):
+    res = when_user_gets_menus(admin_cli, {"fields": "id,name"})
+    assert res.json() == [
+        {"id": with_menu_with_position.id, "name": with_menu_with_position.name}
+    ]
+
+
+def test_get_menus_should_return_requested_position_fields(
+    admin_cli, with_menu_with_position
+):
+    position = with_menu_with_position.positions[0]
+
+    res = when_user_gets_menus(admin_cli, {"fields": "id,positions.name"})
+    assert res.json() == [
+        {"id": with_menu_with_position.id, "positions": [{"name": position.name}]}
+    ]
+
+
+def test_get_menus_should_include_whole_positions(admin_cli, with_menu_with_position):
+    full = when_user_gets_menus(admin_cli, {}).json()
+
+    res = when_user_gets_menus(admin_cli, {"fields": "name", "include": "positions"})
+    assert res.json() == [{"name": full[0]["name"], "positions": full[0]["positions"]}]
+
+
+def test_get_menus_with_all_fields_should_return_default_response(
+    admin_cli, with_menu_with_position
+):
+    fields = "id,name,positions,created_at,updated_at"
+    full = when_user_gets_menus(admin_cli, {})
+
+    res = when_user_gets_menus(admin_cli, {"fields": fields})
+    assert res.content == full.content
+    assert res.headers["ETag"] == full.headers["ETag"]
+
+
+def test_get_menu_should_return_only_requested_fields(admin_cli, with_menu):
+    res = admin_cli.get(f"/api/menu/{with_menu.id}", params={"fields": "name"})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.json() == {"name": with_menu.name}
+
+
+def test_get_menu_with_fields_should_return_not_found(admin_cli):
+    res = admin_cli.get("/api/menu/999", params={"fields": "name"})
+    assert res.status_code == HTTPStatus.NOT_FOUND, res.text
+
+
+def test_get_menus_batch_should_return_only_requested_fields(admin_cli, with_menu):
+    res = admin_cli.get(
+        "/api/menu/batch", params={"ids": f"{with_menu.id},999", "fields": "name"}
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.json() == {str(with_menu.id): {"name": with_menu.name}, "999": None}
+
+
+def test_sparse_menu_should_reflect_changes(admin_cli, with_menu):
+    admin_cli.get(f"/api/menu/{with_menu.id}", params={"fields": "name"})
+
+    admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "renamed"})
+
+    res = admin_cli.get(f"/api/menu/{with_menu.id}", params={"fields": "name"})
+    assert res.json() == {"name": "renamed"}
+
+
+@pytest.mark.parametrize("fields", ["id,name", "id,positions.price"])
+def test_get_menus_with_fields_should_return_not_modified_for_matching_etag(
+    admin_cli, with_menu_with_position, fields
+):
+    etag = when_user_gets_menus(admin_cli, {"fields": fields}).headers["ETag"]
+    assert etag != when_user_gets_menus(admin_cli, {}).headers["ETag"]
+
+    menu_cache.clear()
+    res = admin_cli.get(
+        "/api/menu", params={"fields": fields}, headers={"If-None-Match": etag}
+    )
+    assert res.status_code == HTTPStatus.NOT_MODIFIED, res.text
+
+
+def test_sparse_etag_should_change_when_positions_change(
+    admin_cli, with_menu_with_position
+):
+    position = with_menu_with_position.positions[0]
+    params = {"fields": "id,positions.price"}
+    etag = when_user_gets_menus(admin_cli, params).headers["ETag"]
+
+    admin_cli.patch(f"/api/admin/menu_position/{position.id}", json={"price": 99.0})
+
+    res = when_user_gets_menus(admin_cli, params, headers={"If-None-Match": etag})
+    assert res.json()[0]["positions"] == [{"price": 99.0}]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"fields": "id,secret"},
+        {"fields": "positions.secret"},
+        {"fields": ""},
+        {"include": "menus"},
+    ],
+)
+def test_get_menus_with_unknown_fields_should_return_bad_request(admin_cli, params):
+    res = admin_cli.get("/api/menu", params=params)
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
@@ -59,6 +59,21 @@ def test_create_menu_position_with_some_menu_should_add_position_to_database(
     assert menu_position.menus[0].id == with_menu.id
 
 
+def test_create_menu_position_should_ignore_out_of_range_menu_ids(
+    db_api, admin_cli, with_menu
+):
+    data = {
+        "name": "Some name",
+        "price": 100,
+        "preparation_time": 123,
+        "menus": [with_menu.id, MAX_INT_64 + 1],
+    }
+    res = admin_cli.post("api/admin/menu_position", json=data)
+    assert res.status_code == HTTPStatus.CREATED, res.text
+    menu_position = db_api.query(MenuPosition).first()
+    assert [menu.id for menu in menu_position.menus] == [with_menu.id]
+
+
 def test_create_menu_position_should_add_position_with_proper_data(
     db_api, admin_cli, json_basic_menu_position
 ):
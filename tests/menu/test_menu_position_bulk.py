@@ -0,0 +1,143 @@
+import datetime
+from http import HTTPStatus
+
+from app.api.menu_position import MENU_POSITION_BULK_CHUNK_SIZE
+from app.models.mail_pool import MailPool
+from app.models.menu import Menu, MenuPosition
+from app.schemas.menu import MENU_POSITION_BULK_MAX_SIZE
+
+
+def bulk_position(name, **kwargs):
+    return {
+        "name": name,
+        "price": 10.0,
+        "description": "Some description",
+        "preparation_time": 15,
+        "is_vegan": False,
+    } | kwargs
+
+
+def when_admin_creates_positions(admin_cli, positions):
+    res = admin_cli.post("/api/admin/menu_position/bulk", json={"positions": positions})
+    assert res.status_code == HTTPStatus.OK, res.text
+    return res.json()
+
+
+def test_bulk_create_should_add_positions_to_database(db_api, admin_cli):
+    positions = [bulk_position(f"position_{i}", price=i + 1) for i in range(3)]
+
+    result = when_admin_creates_positions(admin_cli, positions)
+
+    assert [position["name"] for position in result["created"]] == [
+        "position_0",
+        "position_1",
+        "position_2",
+    ]
+    assert result["conflicts"] == []
+    rows = db_api.query(MenuPosition).order_by(MenuPosition.id).all()
+    assert [(row.id, row.name, row.price) for row in rows] == [
+        (position["id"], position["name"], position["price"])
+        for position in result["created"]
+    ]
+    assert all(row.created_at is not None for row in rows)
+
+
+def test_bulk_create_should_report_conflicts_without_aborting_batch(
+    db_api, admin_cli, with_menu_position
+):
+    positions = [
+        bulk_position("first"),
+        bulk_position(with_menu_position.name),
+        bulk_position("second"),
+        bulk_position("first"),
+    ]
+
+    result = when_admin_creates_positions(admin_cli, positions)
+
+    assert [position["name"] for position in result["created"]] == [
+        "first",
+        "second",
+    ]
+    assert result["conflicts"] == [
+        {"index": 1, "name": with_menu_position.name},
+        {"index": 3, "name": "first"},
+    ]
+    assert db_api.query(MenuPosition).count() == 3
+
+
+def test_bulk_create_should_attach_positions_to_existing_menus(
+    db_api, admin_cli, with_menu
+):
+    positions = [
+        bulk_position("first", menus=[with_menu.id, with_menu.id]),
+        bulk_position("second", menus=[with_menu.id, 12345]),
+        bulk_position("third"),
+    ]
+
+    when_admin_creates_positions(admin_cli, positions)
+
+    db_api.expire_all()
+    menu = db_api.get(Menu, with_menu.id)
+    assert [position.name for position in menu.positions] == ["first", "second"]
+    assert menu.positions_count == 2
+
+
+def test_bulk_create_should_ignore_out_of_range_menu_ids(db_api, admin_cli, with_menu):
+    positions = [
+        bulk_position("first", menus=[with_menu.id]),
+        bulk_position("second", menus=[with_menu.id, 2**31]),
+        bulk_position("third", menus=[2**31]),
+    ]
+
+    result = when_admin_creates_positions(admin_cli, positions)
+
+    assert len(result["created"]) == 3
+    db_api.expire_all()
+    menu = db_api.get(Menu, with_menu.id)
+    assert [position.name for position in menu.positions] == ["first", "second"]
+
+
+def test_bulk_create_should_add_positions_to_mail_pool(db_api, admin_cli):
+    result = when_admin_creates_positions(
+        admin_cli, [bulk_position("first"), bulk_position("second")]
+    )
+
+    rows = db_api.query(MailPool).order_by(MailPool.position_id).all()
+    assert [(row.position_id, row.date, row.updated) for row in rows] == [
+        (position["id"], datetime.date.today(), False) for position in result["created"]
+    ]
+
+
+def test_bulk_create_should_insert_more_positions_than_single_chunk(db_api, admin_cli):
+    size = MENU_POSITION_BULK_CHUNK_SIZE + 1
+    positions = [bulk_position(f"position_{i}") for i in range(size)]
+
+    result = when_admin_creates_positions(admin_cli, positions)
+
+    assert len(result["created"]) == size
+    assert db_api.query(MenuPosition).count() == size
+    assert db_api.query(MailPool).count() == size
+
+
+def test_bulk_create_should_invalidate_cached_menus(admin_cli, with_menu):
+    assert admin_cli.get(f"/api/menu/{with_menu.id}").json()["positions"] == []
+
+    when_admin_creates_positions(
+        admin_cli, [bulk_position("first", menus=[with_menu.id])]
+    )
+
+    res = admin_cli.get(f"/api/menu/{with_menu.id}")
+    assert [position["name"] for position in res.json()["positions"]] == ["first"]
+
+
+def test_bulk_create_with_too_many_positions_should_raise_http_error(admin_cli):
+    positions = [bulk_position(f"position_{i}") for i in range(2)]
+    positions *= MENU_POSITION_BULK_MAX_SIZE // 2 + 1
+
+    res = admin_cli.post("/api/admin/menu_position/bulk", json={"positions": positions})
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, res.text
+
+
+def test_bulk_create_without_positions_should_raise_http_error(admin_cli):
+    res = admin_cli.post("/api/admin/menu_position/bulk", json={"positions": []})
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, res.text
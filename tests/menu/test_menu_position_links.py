@@ -0,0 +1,179 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import select
+
+from app.models.menu import Menu, MenuMenuPosition, MenuPosition
+from app.schemas.menu import MENU_POSITION_LINKS_MAX_SIZE
+from tests.menu.fixtures import hundred_menu_positions
+
+
+@pytest.fixture
+def two_menus(db_api):
+    menus = [Menu(name=f"menu_{i}") for i in range(2)]
+    db_api.add_all(menus)
+    db_api.commit()
+    return menus
+
+
+def link(menu_id, menu_position_id):
+    return {"menu_id": menu_id, "menu_position_id": menu_position_id}
+
+
+def when_admin_updates_links(admin_cli, attach=(), detach=()):
+    res = admin_cli.post(
+        "/api/admin/menu/positions",
+        json={"attach": list(attach), "detach": list(detach)},
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+    return res.json()
+
+
+def then_links_should_be(db_api, expected):
+    links = db_api.execute(
+        select(MenuMenuPosition.c.menu_id, MenuMenuPosition.c.menu_position_id)
+    ).all()
+    assert sorted(links) == sorted(expected)
+
+
+def test_attach_links_should_add_rows_and_return_count(
+    db_api, admin_cli, two_menus, hundred_menu_positions
+):
+    first, second = (menu.id for menu in two_menus)
+
+    result = when_admin_updates_links(
+        admin_cli, attach=[link(first, 1), link(first, 2), link(second, 1)]
+    )
+
+    assert result == {"added": 3, "removed": 0}
+    then_links_should_be(db_api, [(first, 1), (first, 2), (second, 1)])
+
+
+def test_attach_links_should_skip_existing_duplicated_and_unknown_pairs(
+    db_api, admin_cli, with_menu_with_position
+):
+    menu_id = with_menu_with_position.id
+    position_id = with_menu_with_position.positions[0].id
+
+    result = when_admin_updates_links(
+        admin_cli,
+        attach=[
+            link(menu_id, position_id),
+            link(menu_id, 999),
+            link(999, position_id),
+        ],
+    )
+
+    assert result == {"added": 0, "removed": 0}
+    then_links_should_be(db_api, [(menu_id, position_id)])
+
+
+def test_detach_links_should_remove_only_existing_rows(
+    db_api, admin_cli, with_menu_with_position
+):
+    menu_id = with_menu_with_position.id
+    position_id = with_menu_with_position.positions[0].id
+
+    result = when_admin_updates_links(
+        admin_cli,
+        detach=[link(menu_id, position_id), link(menu_id, position_id + 1)],
+    )
+
+    assert result == {"added": 0, "removed": 1}
+    then_links_should_be(db_api, [])
+
+
+def test_update_links_should_attach_and_detach_in_one_call(
+    db_api, admin_cli, two_menus, hundred_menu_positions
+):
+    first, second = (menu.id for menu in two_menus)
+    when_admin_updates_links(admin_cli, attach=[link(first, 1), link(first, 2)])
+
+    result = when_admin_updates_links(
+        admin_cli,
+        attach=[link(second, 1), link(second, 1)],
+        detach=[link(first, 1)],
+    )
+
+    assert result == {"added": 1, "removed": 1}
+    then_links_should_be(db_api, [(first, 2), (second, 1)])
+
+
+def test_update_links_should_update_positions_count(
+    db_api, admin_cli, two_menus, hundred_menu_positions
+):
+    first, second = (menu.id for menu in two_menus)
+
+    when_admin_updates_links(admin_cli, attach=[link(first, i) for i in range(1, 51)])
+    when_admin_updates_links(admin_cli, detach=[link(first, i) for i in range(1, 11)])
+
+    db_api.expire_all()
+    assert db_api.get(Menu, first).positions_count == 40
+    assert db_api.get(Menu, second).positions_count == 0
+
+
+def test_update_links_with_same_pair_in_attach_and_detach_should_raise_http_error(
+    db_api, admin_cli, with_menu, with_menu_position
+):
+    pair = link(with_menu.id, with_menu_position.id)
+
+    res = admin_cli.post(
+        "/api/admin/menu/positions", json={"attach": [pair], "detach": [pair]}
+    )
+
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+    then_links_should_be(db_api, [])
+
+
+def test_update_links_with_too_many_pairs_should_raise_http_error(admin_cli):
+    pairs = [link(1, i) for i in range(1, MENU_POSITION_LINKS_MAX_SIZE + 2)]
+
+    res = admin_cli.post("/api/admin/menu/positions", json={"attach": pairs})
+
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, res.text
+
+
+def test_update_links_should_invalidate_cached_menu(
+    admin_cli, with_menu, with_menu_position
+):
+    assert admin_cli.get(f"/api/menu/{with_menu.id}").json()["positions"] == []
+
+    when_admin_updates_links(
+        admin_cli, attach=[link(with_menu.id, with_menu_position.id)]
+    )
+
+    res = admin_cli.get(f"/api/menu/{with_menu.id}")
+    assert [position["id"] for position in res.json()["positions"]] == [
+        with_menu_position.id
+    ]
+
+
+def test_update_menu_positions_should_attach_and_detach_positions(
+    db_api, admin_cli, with_menu_with_position, hundred_menu_positions
+):
+    menu_id = with_menu_with_position.id
+    position_id = with_menu_with_position.positions[0].id
+    other_ids = [
+        position.id
+        for position in db_api.query(MenuPosition).filter(
+            MenuPosition.id != position_id
+        )
+    ][:3]
+
+    res = admin_cli.post(
+        f"/api/admin/menu/{menu_id}/positions",
+        json={"attach": other_ids, "detach": [position_id]},
+    )
+
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.json() == {"added": 3, "removed": 1}
+    then_links_should_be(db_api, [(menu_id, other_id) for other_id in other_ids])
+
+
+def test_update_positions_of_not_existing_menu_should_raise_http_error(
+    admin_cli, with_menu_position
+):
+    res = admin_cli.post(
+        "/api/admin/menu/999/positions", json={"attach": [with_menu_position.id]}
+    )
+    assert res.status_code == HTTPStatus.NOT_FOUND, res.text
@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.pagination import NEXT_CURSOR_HEADER, encode_cursor
+from app.main import app
+from tests.menu.fixtures import fifty_tomato_positions, menu_positions_for_search
+
+
+def when_user_lists_menu_positions(test_client, params=None):
+    res = test_client.get("/api/menu_position/", params=params)
+    assert res.status_code == HTTPStatus.OK, res.text
+    return res
+
+
+def get_names(res):
+    return [position["name"] for position in res.json()]
+
+
+def test_list_menu_positions_should_be_public(menu_positions_for_search):
+    with TestClient(app) as client:
+        res = when_user_lists_menu_positions(client)
+    assert get_names(res) == [
+        "Cheesecake",
+        "Pork chop",
+        "Spicy tomato pasta",
+        "Tomato soup",
+    ]
+
+
+@pytest.mark.parametrize(
+    "sortby, expected_names",
+    [
+        ("name", ["Cheesecake", "Pork chop", "Spicy tomato pasta", "Tomato soup"]),
+        ("price", ["Tomato soup", "Cheesecake", "Spicy tomato pasta", "Pork chop"]),
+        (
+            "preparation_time",
+            ["Cheesecake", "Tomato soup", "Spicy tomato pasta", "Pork chop"],
+        ),
+    ],
+)
+def test_list_menu_positions_should_sort(
+    admin_cli, menu_positions_for_search, sortby, expected_names
+):
+    res = when_user_lists_menu_positions(admin_cli, {"sortby": sortby})
+    assert get_names(res) == expected_names
+
+
+@pytest.mark.parametrize(
+    "params, expected_names",
+    [
+        ({"is_vegan": True}, ["Spicy tomato pasta", "Tomato soup"]),
+        ({"is_vegan": False}, ["Cheesecake", "Pork chop"]),
+        ({"price_min": 20, "price_max": 30}, ["Spicy tomato pasta"]),
+        (
+            {"preparation_time_max": 15},
+            ["Cheesecake", "Spicy tomato pasta", "Tomato soup"],
+        ),
+        ({"is_vegan": True, "preparation_time_min": 11}, ["Spicy tomato pasta"]),
+    ],
+)
+def test_list_menu_positions_should_apply_filters(
+    admin_cli, menu_positions_for_search, params, expected_names
+):
+    res = when_user_lists_menu_positions(admin_cli, params)
+    assert get_names(res) == expected_names
+
+
+@pytest.mark.parametrize("sortby", ["name", "price", "preparation_time"])
+def test_list_menu_positions_should_paginate_with_cursor(
+    admin_cli, fifty_tomato_positions, sortby
+):
+    all_ids = [
+        position["id"]
+        for position in when_user_lists_menu_positions(
+            admin_cli, {"sortby": sortby}
+        ).json()
+    ]
+
+    ids, cursor = [], None
+    while True:
+        params = {"sortby": sortby, "limit": 20}
+        if cursor is not None:
+            params["cursor"] = cursor
+        res = when_user_lists_menu_positions(admin_cli, params)
+        ids += [position["id"] for position in res.json()]
+        cursor = res.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert len(all_ids) == 50
+    assert ids == all_ids
+
+
+def test_list_menu_positions_with_cursor_of_other_sorting_should_return_bad_request(
+    admin_cli,
+):
+    params = {"sortby": "price", "cursor": encode_cursor("name", ["a", 1])}
+    res = admin_cli.get("/api/menu_position/", params=params)
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+
+
+@pytest.mark.parametrize(
+    "sortby, values",
+    [
+        ("price", ["cheap", 1]),
+        ("price", [float("inf"), 1]),
+        ("name", ["tomato", -(2**31) - 1]),
+        ("preparation_time", [None, 1]),
+    ],
+)
+def test_list_menu_positions_with_cursor_values_of_wrong_type_should_return_bad_request(
+    admin_cli, with_menu_position, sortby, values
+):
+    params = {"sortby": sortby, "cursor": encode_cursor(sortby, values)}
+    res = admin_cli.get("/api/menu_position/", params=params)
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+
+
+def test_list_menu_positions_with_invalid_sorting_should_return_unprocessable_entity(
+    admin_cli,
+):
+    res = admin_cli.get("/api/menu_position/", params={"sortby": "description"})
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, res.text
+
+
+@pytest.mark.parametrize("param", ["preparation_time_min", "preparation_time_max"])
+def test_list_menu_positions_with_too_long_preparation_time_should_return_unprocessable_entity(
+    admin_cli, param
+):
+    res = admin_cli.get("/api/menu_position/", params={param: 3000000000})
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, res.text
@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.pagination import encode_cursor
+from app.main import app
+from tests.menu.fixtures import fifty_tomato_positions, menu_positions_for_search
+
+
+def when_user_searches_menu_positions(test_client, params):
+    res = test_client.get("/api/menu_position/search", params=params)
+    assert res.status_code == HTTPStatus.OK, res.text
+    return [position["name"] for position in res.json()]
+
+
+def test_search_menu_positions_should_be_public(menu_positions_for_search):
+    with TestClient(app) as client:
+        res = client.get("/api/menu_position/search", params={"q": "soup"})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert [position["name"] for position in res.json()] == ["Tomato soup"]
+
+
+def test_search_menu_positions_should_match_name_and_description(
+    admin_cli, menu_positions_for_search
+):
+    names = when_user_searches_menu_positions(admin_cli, {"q": "tomato"})
+    assert set(names) == {"Tomato soup", "Pork chop", "Spicy tomato pasta"}
+
+
+def test_search_menu_positions_should_rank_name_matches_first(
+    admin_cli, menu_positions_for_search
+):
+    names = when_user_searches_menu_positions(admin_cli, {"q": "tomato"})
+    assert names[-1] == "Pork chop"
+
+
+def test_search_menu_positions_should_support_web_search_syntax(
+    admin_cli, menu_positions_for_search
+):
+    names = when_user_searches_menu_positions(admin_cli, {"q": "tomato -soup"})
+    assert set(names) == {"Pork chop", "Spicy tomato pasta"}
+
+    names = when_user_searches_menu_positions(admin_cli, {"q": '"tomato pasta"'})
+    assert names == ["Spicy tomato pasta"]
+
+
+def test_search_menu_positions_should_return_empty_list_when_nothing_matches(
+    admin_cli, menu_positions_for_search
+):
+    assert when_user_searches_menu_positions(admin_cli, {"q": "sushi"}) == []
+
+
+@pytest.mark.parametrize(
+    "params, expected_names",
+    [
+        ({"is_vegan": True}, {"Tomato soup", "Spicy tomato pasta"}),
+        ({"is_vegan": False}, {"Pork chop"}),
+        ({"price_min": 20}, {"Pork chop", "Spicy tomato pasta"}),
+        ({"price_max": 20}, {"Tomato soup"}),
+        (
+            {"preparation_time_min": 15, "preparation_time_max": 20},
+            {"Spicy tomato pasta"},
+        ),
+        ({"is_vegan": True, "price_min": 20}, {"Spicy tomato pasta"}),
+    ],
+)
+def test_search_menu_positions_should_apply_filters(
+    admin_cli, menu_positions_for_search, params, expected_names
+):
+    names = when_user_searches_menu_positions(admin_cli, {"q": "tomato"} | params)
+    assert set(names) == expected_names
+
+
+def test_search_menu_positions_without_phrase_should_return_unprocessable_entity(
+    admin_cli,
+):
+    res = admin_cli.get("/api/menu_position/search")
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, res.text
+
+
+@pytest.mark.parametrize("param", ["preparation_time_min", "preparation_time_max"])
+def test_search_menu_positions_with_too_long_preparation_time_should_return_unprocessable_entity(
+    admin_cli, param
+):
+    params = {"q": "tomato", param: 3000000000}
+    res = admin_cli.get("/api/menu_position/search", params=params)
+    assert res.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, res.text
+
+
+def test_search_menu_positions_should_be_paginated(admin_cli, fifty_tomato_positions):
+    pages = []
+    params = {"q": "tomato", "limit": 20}
+    while True:
+        res = admin_cli.get("/api/menu_position/search", params=params)
+        assert res.status_code == HTTPStatus.OK, res.text
+        pages.append(res.json())
+        if "X-Next-Cursor" not in res.headers:
+            break
+        params = params | {"cursor": res.headers["X-Next-Cursor"]}
+
+    assert [len(page) for page in pages] == [20, 20, 10]
+    positions = [position for page in pages for position in page]
+    assert len({position["id"] for position in positions}) == 50
+
+    tomato_counts = [position["description"].count("tomato") for position in positions]
+    assert tomato_counts == sorted(tomato_counts, reverse=True)
+
+
+def test_search_menu_positions_with_cursor_of_other_sorting_should_return_bad_request(
+    admin_cli, fifty_tomato_positions
+):
+    cursor = encode_cursor("name", ["tomato_1", 1])
+    res = admin_cli.get(
+        "/api/menu_position/search", params={"q": "tomato", "cursor": cursor}
+    )
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+
+
+def test_search_menu_positions_with_cursor_values_of_wrong_type_should_return_bad_request(
+    admin_cli, fifty_tomato_positions
+):
+    cursor = encode_cursor("rank", ["high", 1])
+    res = admin_cli.get(
+        "/api/menu_position/search", params={"q": "tomato", "cursor": cursor}
+    )
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
@@ -0,0 +1,306 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import text
+
+from app.api.menu import select_menus
+from app.api.menu_position import select_menu_positions
+from app.api.pagination import encode_cursor
+from app.models.menu import Menu, MenuPosition
+from app.schemas.menu import MenuPositionsQuerySchema, MenusQuerySchema
+from app.utils.cache import menu_cache
+from tests.menu.fixtures import (
+    five_hundred_menus_with_positions,
+    hundred_menu_positions,
+    hundred_menus,
+)
+
+
+def test_get_menus_should_load_positions_in_constant_number_of_queries(
+    admin_cli, executed_statements, five_hundred_menus_with_positions
+):
+    res = admin_cli.get("/api/menu", params={"limit": 500})
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    menu_cache.clear()
+    executed_statements.clear()
+    res = admin_cli.get("/api/menu", params={"limit": 500})
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    menus = res.json()
+    assert len(menus) == 500
+    assert all(len(menu["positions"]) == 3 for menu in menus)
+    assert len(executed_statements) == 2
+
+
+def test_get_menu_should_load_positions_in_constant_number_of_queries(
+    admin_cli, executed_statements, five_hundred_menus_with_positions
+):
+    res = admin_cli.get("/api/menu/1")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert len(res.json()["positions"]) == 3
+    assert len(executed_statements) == 4
+
+
+def test_get_menu_with_snapshot_should_run_single_query(
+    admin_cli, executed_statements, five_hundred_menus_with_positions
+):
+    admin_cli.get("/api/menu/1")
+
+    menu_cache.clear()
+    executed_statements.clear()
+    res = admin_cli.get("/api/menu/1")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert len(res.json()["positions"]) == 3
+    assert len(executed_statements) == 1
+
+
+@pytest.mark.parametrize("size", [1, 20])
+def test_get_menus_batch_should_run_constant_number_of_queries(
+    admin_cli, executed_statements, five_hundred_menus_with_positions, size
+):
+    ids = ",".join(str(menu_id) for menu_id in range(1, size + 1))
+    res = admin_cli.get("/api/menu/batch", params={"ids": ids})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert len(res.json()) == size
+    assert len(executed_statements) == 4
+
+    menu_cache.clear()
+    executed_statements.clear()
+    res = admin_cli.get("/api/menu/batch", params={"ids": ids})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert len(executed_statements) == 1
+
+    executed_statements.clear()
+    res = admin_cli.get("/api/menu/batch", params={"ids": ids})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert executed_statements == []
+
+
+def test_get_menus_without_positions_should_not_read_association_table(
+    admin_cli, executed_statements, five_hundred_menus_with_positions
+):
+    res = admin_cli.get("/api/menu", params={"limit": 500, "fields": "id,name"})
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    etag = res.headers["ETag"]
+    menu_cache.clear()
+    res = admin_cli.get(
+        "/api/menu",
+        params={"limit": 500, "fields": "id,name"},
+        headers={"If-None-Match": etag},
+    )
+    assert res.status_code == HTTPStatus.NOT_MODIFIED, res.text
+
+    assert len(executed_statements) == 2
+    assert not any("menu_position" in statement for statement in executed_statements)
+    assert "created_at" not in executed_statements[0]
+
+
+def test_get_menus_with_position_fields_should_select_only_those_columns(
+    admin_cli, executed_statements, five_hundred_menus_with_positions
+):
+    res = admin_cli.get(
+        "/api/menu", params={"limit": 500, "fields": "id,positions.name"}
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert all(len(menu["positions"]) == 3 for menu in res.json())
+
+    assert len(executed_statements) == 2
+    positions_statement = executed_statements[1]
+    assert "menu_position.name" in positions_statement
+    assert "menu_position.description" not in positions_statement
+    assert "menu_position.updated_at" not in positions_statement
+
+
+def test_delete_menu_should_not_touch_menus_sharing_its_positions(
+    admin_cli, db_api, executed_statements, five_hundred_menus_with_positions
+):
+    res = admin_cli.delete("/api/admin/menu/1")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert len(res.json()["positions"]) == 3
+    assert len(executed_statements) == 8
+
+    assert db_api.query(Menu).count() == 499
+
+
+def test_add_and_remove_position_should_run_constant_number_of_queries(
+    admin_cli, db_api, executed_statements, five_hundred_menus_with_positions
+):
+    menu = Menu(name="empty_menu")
+    db_api.add(menu)
+    db_api.commit()
+
+    res = admin_cli.post(f"/api/admin/menu/{menu.id}/add_position/1")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert [position["id"] for position in res.json()["positions"]] == [1]
+    assert len(executed_statements) == 10
+
+    executed_statements.clear()
+    res = admin_cli.post(f"/api/admin/menu/{menu.id}/remove_position/1")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.json()["positions"] == []
+    assert len(executed_statements) == 10
+
+
+@pytest.mark.parametrize("size", [1, 200])
+def test_bulk_create_positions_should_run_constant_number_of_queries(
+    admin_cli, executed_statements, five_hundred_menus_with_positions, size
+):
+    positions = [
+        {
+            "name": f"bulk_position_{i}",
+            "price": 10.0,
+            "preparation_time": 15,
+            "menus": [1, 2, 3],
+        }
+        for i in range(size)
+    ]
+
+    res = admin_cli.post("/api/admin/menu_position/bulk", json={"positions": positions})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert len(res.json()["created"]) == size
+    assert len(executed_statements) == 9
+
+
+@pytest.mark.parametrize("size", [1, 200])
+def test_update_menu_position_links_should_run_constant_number_of_queries(
+    admin_cli, executed_statements, hundred_menus, hundred_menu_positions, size
+):
+    links = [
+        {"menu_id": i % 100 + 1, "menu_position_id": i // 100 + 1} for i in range(size)
+    ]
+
+    res = admin_cli.post("/api/admin/menu/positions", json={"attach": links})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.json() == {"added": size, "removed": 0}
+    assert len(executed_statements) == 6
+
+    executed_statements.clear()
+    res = admin_cli.post("/api/admin/menu/positions", json={"detach": links})
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.json() == {"added": 0, "removed": size}
+    assert len(executed_statements) == 6
+
+
+@pytest.mark.parametrize("size", [1, 100])
+def test_update_menu_positions_should_run_constant_number_of_queries(
+    admin_cli, db_api, executed_statements, hundred_menu_positions, size
+):
+    menu = Menu(name="menu", positions=db_api.query(MenuPosition).all())
+    db_api.add(menu)
+    db_api.commit()
+    positions = list(range(100 - size + 1, 101))
+
+    res = admin_cli.put(
+        f"/api/admin/menu/{menu.id}", json={"name": "menu", "positions": positions}
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert [position["id"] for position in res.json()["positions"]] == positions
+    assert len(executed_statements) == 9
+
+
+@pytest.mark.parametrize("size", [1, 100])
+def test_update_menu_position_menus_should_run_constant_number_of_queries(
+    admin_cli, executed_statements, hundred_menus, with_menu_position, size
+):
+    data = {
+        "name": with_menu_position.name,
+        "price": 10.0,
+        "preparation_time": 15,
+        "is_vegan": False,
+    }
+    res = admin_cli.put(
+        f"/api/admin/menu_position/{with_menu_position.id}",
+        json=data | {"menus": list(range(1, 101))},
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    executed_statements.clear()
+    res = admin_cli.put(
+        f"/api/admin/menu_position/{with_menu_position.id}",
+        json=data | {"menus": list(range(1, size + 1))},
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert len(executed_statements) == 10
+
+
+def test_get_menus_name_filter_should_use_trigram_index(db_api):
+    if not db_api.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")):
+        pytest.skip("pg_trgm extension is not available")
+
+    db_api.execute(
+        text(
+            "INSERT INTO menu (name, created_at, updated_at) "
+            "SELECT 'menu_' || i, now(), now() "
+            "FROM generate_series(1, 100000) AS i"
+        )
+    )
+    db_api.commit()
+    db_api.execute(text("ANALYZE menu"))
+
+    statement = select_menus(MenusQuerySchema(name="enu_4242"))
+    compiled = statement.compile(
+        dialect=db_api.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = db_api.scalars(text(f"EXPLAIN {compiled}")).all()
+
+    assert any("ix_menu_name_trgm" in line for line in plan), "\n".join(plan)
+
+
+@pytest.mark.parametrize(
+    "query, index",
+    [
+        (MenuPositionsQuerySchema(sortby="name"), "ix_menu_position_name_id"),
+        (
+            MenuPositionsQuerySchema(sortby="price", price_min=10, price_max=20),
+            "ix_menu_position_price_id",
+        ),
+        (
+            MenuPositionsQuerySchema(
+                sortby="preparation_time",
+                preparation_time_max=30,
+                cursor=encode_cursor("preparation_time", [10, 5000]),
+            ),
+            "ix_menu_position_preparation_time_id",
+        ),
+    ],
+)
+def test_list_menu_positions_should_use_composite_index(db_api, query, index):
+    db_api.execute(
+        text(
+            "INSERT INTO menu_position "
+            "(name, price, preparation_time, is_vegan, created_at, updated_at) "
+            "SELECT 'position_' || i, i % 100 + 1, i % 60 + 1, i % 2 = 0, now(), now() "
+            "FROM generate_series(1, 100000) AS i"
+        )
+    )
+    db_api.commit()
+    db_api.execute(text("ANALYZE menu_position"))
+
+    compiled = select_menu_positions(query).compile(
+        dialect=db_api.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = db_api.scalars(text(f"EXPLAIN {compiled}")).all()
+
+    assert any(index in line for line in plan), "\n".join(plan)
+    assert not any("Sort" in line for line in plan), "\n".join(plan)
+
+
+def test_patch_menu_position_should_update_row_in_single_statement(
+    admin_cli, executed_statements, with_menu_position
+):
+    res = admin_cli.patch(
+        f"/api/admin/menu_position/{with_menu_position.id}", json={"price": 12.5}
+    )
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.json()["price"] == 12.5
+
+    statements = [
+        statement
+        for statement in executed_statements
+        if "menu_position." in statement and "menu_menu_position" not in statement
+    ]
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE menu_position SET")
+    assert "RETURNING" in statements[0]
@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.models.menu import Menu, MenuPosition
+from app.settings import settings
+from app.utils.cache import menu_cache
+
+
+def when_user_gets_raw_responses(test_client, url, monkeypatch):
+    contents = []
+    for fast_json_responses in [False, True]:
+        monkeypatch.setattr(settings, "fast_json_responses", fast_json_responses)
+        menu_cache.clear()
+        res = test_client.get(url)
+        assert res.status_code == HTTPStatus.OK, res.text
+        contents.append(res.content)
+    return contents
+
+
+@pytest.fixture
+def menu_with_various_positions(db_api, json_basic_menu_position):
+    menu = Menu(
+        name="menu",
+        positions=[
+            MenuPosition(
+                **json_basic_menu_position | {"name": "vegan", "is_vegan": True}
+            ),
+            MenuPosition(**json_basic_menu_position | {"name": "soup", "price": 12.5}),
+            MenuPosition(
+                **json_basic_menu_position
+                | {"name": "no_description", "description": None}
+            ),
+        ],
+    )
+    db_api.add(menu)
+    db_api.commit()
+    return menu
+
+
+def test_fast_json_menu_should_match_validated_response(
+    admin_cli, monkeypatch, menu_with_various_positions
+):
+    url = f"/api/menu/{menu_with_various_positions.id}"
+    validated, trusted = when_user_gets_raw_responses(admin_cli, url, monkeypatch)
+
+    assert trusted == validated
+
+
+def test_fast_json_menus_should_match_validated_response(
+    admin_cli, monkeypatch, menu_with_various_positions
+):
+    validated, trusted = when_user_gets_raw_responses(
+        admin_cli, "/api/menu", monkeypatch
+    )
+
+    assert trusted == validated
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+from app.models.menu import MenuSnapshot
+from app.utils.cache import menu_cache
+
+
+def then_snapshot_should_match_response(admin_cli, db_api, menu_id):
+    db_api.expire_all()
+    snapshot = db_api.get(MenuSnapshot, menu_id)
+    assert snapshot is not None
+
+    menu_cache.clear()
+    res = admin_cli.get(f"/api/menu/{menu_id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert res.content == snapshot.body
+    assert res.headers["ETag"] == snapshot.etag
+    return res.json()
+
+
+def test_create_menu_should_store_snapshot(admin_cli, db_api, with_menu_position):
+    res = admin_cli.post(
+        "/api/admin/menu",
+        json={"name": "new_menu", "positions": [with_menu_position.id]},
+    )
+    assert res.status_code == HTTPStatus.CREATED, res.text
+
+    menu = then_snapshot_should_match_response(admin_cli, db_api, res.json()["id"])
+    assert menu["name"] == "new_menu"
+    assert len(menu["positions"]) == 1
+
+
+def test_get_menu_without_snapshot_should_store_it(admin_cli, db_api, with_menu):
+    assert db_api.get(MenuSnapshot, with_menu.id) is None
+
+    res = admin_cli.get(f"/api/menu/{with_menu.id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    then_snapshot_should_match_response(admin_cli, db_api, with_menu.id)
+
+
+def test_menu_changes_should_regenerate_snapshot(
+    admin_cli, db_api, with_menu, with_menu_position
+):
+    admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "renamed"})
+    menu = then_snapshot_should_match_response(admin_cli, db_api, with_menu.id)
+    assert menu["name"] == "renamed"
+
+    admin_cli.post(
+        f"/api/admin/menu/{with_menu.id}/add_position/{with_menu_position.id}"
+    )
+    menu = then_snapshot_should_match_response(admin_cli, db_api, with_menu.id)
+    assert len(menu["positions"]) == 1
+
+    admin_cli.put(
+        f"/api/admin/menu_position/{with_menu_position.id}",
+        json={
+            "name": "new_name",
+            "price": 5.0,
+            "description": "new_description",
+            "preparation_time": 5,
+            "is_vegan": True,
+            "menus": [with_menu.id],
+        },
+    )
+    menu = then_snapshot_should_match_response(admin_cli, db_api, with_menu.id)
+    assert menu["positions"][0]["name"] == "new_name"
+
+    admin_cli.delete(f"/api/admin/menu_position/{with_menu_position.id}")
+    menu = then_snapshot_should_match_response(admin_cli, db_api, with_menu.id)
+    assert menu["positions"] == []
+
+
+def test_delete_menu_should_delete_snapshot(admin_cli, db_api, with_menu):
+    admin_cli.get(f"/api/menu/{with_menu.id}")
+
+    res = admin_cli.delete(f"/api/admin/menu/{with_menu.id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    assert db_api.query(MenuSnapshot).count() == 0
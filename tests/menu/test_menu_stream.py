@@ -0,0 +1,132 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+from contextlib import AsyncExitStack
+from http import HTTPStatus
+
+import httpx
+import pytest
+import uvicorn
+
+from app.api.utils import create_access_token
+from app.main import app
+from app.settings import settings
+from app.utils.broadcast import menu_broadcaster
+
+IDLE_SUBSCRIBERS = 200
+
+
+@pytest.fixture
+def live_server(monkeypatch):
+    monkeypatch.setattr(settings, "menu_changes_listener_enabled", False)
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(
+        uvicorn.Config(app, log_level="warning", timeout_keep_alive=1)
+    )
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]})
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    server.should_exit = True
+    thread.join(timeout=10)
+    sock.close()
+
+
+def wait_for_subscribers(count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while menu_broadcaster.status()["subscribers"] != count:
+        assert time.monotonic() < deadline, "subscribers not updated in time"
+        time.sleep(0.05)
+
+
+def given_subscribed_stream(client):
+    lines = client.iter_lines()
+    assert next(lines) == ": subscribed"
+    return lines
+
+
+def when_next_event_arrives(lines):
+    for line in lines:
+        if line.startswith("event: "):
+            event = line.removeprefix("event: ")
+        elif line.startswith("data: "):
+            return event, json.loads(line.removeprefix("data: "))
+
+
+def admin_headers():
+    token = create_access_token(data={"sub": "test"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_stream_should_push_change_after_admin_write(live_server, with_menu):
+    with httpx.Client(base_url=live_server, timeout=5) as client:
+        with client.stream("GET", "/api/menu/stream") as stream:
+            assert stream.status_code == HTTPStatus.OK
+            assert stream.headers["content-type"].startswith("text/event-stream")
+            lines = given_subscribed_stream(stream)
+
+            res = client.patch(
+                f"/api/admin/menu/{with_menu.id}",
+                json={"name": "renamed"},
+                headers=admin_headers(),
+            )
+            assert res.status_code == HTTPStatus.OK, res.text
+
+            assert when_next_event_arrives(lines) == (
+                "change",
+                {"kind": "updated", "menus": [with_menu.id], "positions": []},
+            )
+
+
+def test_stream_should_push_attached_position(
+    live_server, with_menu, with_menu_position
+):
+    with httpx.Client(base_url=live_server, timeout=5) as client:
+        with client.stream("GET", "/api/menu/stream") as stream:
+            lines = given_subscribed_stream(stream)
+
+            res = client.post(
+                f"/api/admin/menu/{with_menu.id}/add_position/{with_menu_position.id}",
+                headers=admin_headers(),
+            )
+            assert res.status_code == HTTPStatus.OK, res.text
+
+            assert when_next_event_arrives(lines) == (
+                "change",
+                {
+                    "kind": "attached",
+                    "menus": [with_menu.id],
+                    "positions": [with_menu_position.id],
+                },
+            )
+
+
+def test_idle_subscribers_should_not_need_thread_per_client(live_server):
+    async def scenario():
+        limits = httpx.Limits(max_connections=None)
+        async with AsyncExitStack() as stack:
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(base_url=live_server, limits=limits, timeout=10)
+            )
+            threads = threading.active_count()
+            streams = await asyncio.gather(
+                *[
+                    stack.enter_async_context(client.stream("GET", "/api/menu/stream"))
+                    for _ in range(IDLE_SUBSCRIBERS)
+                ]
+            )
+            for stream in streams:
+                await anext(stream.aiter_bytes())
+            return threads, threading.active_count(), menu_broadcaster.status()
+
+    threads_before, threads_during, status = asyncio.run(scenario())
+
+    assert status["subscribers"] == IDLE_SUBSCRIBERS
+    assert threads_during == threads_before
+    wait_for_subscribers(0)
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import threading
+
+from app.utils.broadcast import RESET_EVENT, Broadcaster, menu_broadcaster
+from app.utils.changes import ORIGIN, decode_changes, dispatch
+
+
+async def collect(subscription, count):
+    return [await subscription.get(timeout=1) for _ in range(count)]
+
+
+def test_broadcaster_should_deliver_message_to_every_subscriber():
+    async def scenario():
+        broadcaster = Broadcaster(queue_size=2)
+        with broadcaster.subscribe() as first, broadcaster.subscribe() as second:
+            broadcaster.publish(b"message")
+            return await collect(first, 1), await collect(second, 1)
+
+    assert asyncio.run(scenario()) == ([b"message"], [b"message"])
+
+
+def test_broadcaster_should_drop_oldest_messages_of_slow_subscriber():
+    async def scenario():
+        broadcaster = Broadcaster(queue_size=2)
+        with broadcaster.subscribe() as subscription:
+            for message in [b"1", b"2", b"3", b"4"]:
+                broadcaster.publish(message)
+            return await collect(subscription, 3), broadcaster.status()
+
+    messages, status = asyncio.run(scenario())
+
+    assert messages == [RESET_EVENT, b"3", b"4"]
+    assert status["published"] == 4
+    assert status["dropped"] == 2
+
+
+def test_subscription_should_return_none_after_timeout():
+    async def scenario():
+        with Broadcaster(queue_size=2).subscribe() as subscription:
+            return await subscription.get(timeout=0.01)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_broadcaster_should_forget_closed_subscription():
+    async def scenario():
+        broadcaster = Broadcaster(queue_size=2)
+        with broadcaster.subscribe():
+            assert broadcaster.status()["subscribers"] == 1
+        broadcaster.publish(b"message")
+        return broadcaster.status()
+
+    assert asyncio.run(scenario())["subscribers"] == 0
+
+
+def test_broadcaster_should_deliver_message_published_from_other_thread():
+    async def scenario():
+        broadcaster = Broadcaster(queue_size=2)
+        with broadcaster.subscribe() as subscription:
+            publisher = threading.Thread(target=broadcaster.publish, args=[b"message"])
+            publisher.start()
+            publisher.join()
+            return await collect(subscription, 1)
+
+    assert asyncio.run(scenario()) == [b"message"]
+
+
+def test_changes_from_other_worker_should_be_broadcast():
+    payload = json.dumps({"origin": ORIGIN, "events": [["deleted", [1], [2, 3]]]})
+
+    async def scenario():
+        with menu_broadcaster.subscribe() as subscription:
+            dispatch(decode_changes(payload)[1])
+            return await collect(subscription, 1)
+
+    [message] = asyncio.run(scenario())
+
+    assert message == (
+        b'event: change\ndata: {"kind":"deleted","menus":[1],"positions":[2,3]}\n\n'
+    )
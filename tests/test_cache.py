@@ -0,0 +1,94 @@
+from unittest import mock
+
+from app.utils.cache import ResponseCache
+
+
+def test_cache_should_return_stored_value():
+    cache = ResponseCache(max_size=2, ttl=60)
+    cache.set("key", "value", cache.generation, tags=[])
+
+    assert cache.get("key") == "value"
+    assert cache.get("other") is None
+    assert cache.metrics.hits == 1
+    assert cache.metrics.misses == 1
+
+
+def test_cache_should_evict_least_recently_used_entry():
+    cache = ResponseCache(max_size=2, ttl=60)
+    cache.set("a", 1, cache.generation, tags=[])
+    cache.set("b", 2, cache.generation, tags=[])
+    cache.get("a")
+    cache.set("c", 3, cache.generation, tags=[])
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.metrics.evictions == 1
+
+
+def test_cache_should_expire_entries_after_ttl():
+    cache = ResponseCache(max_size=2, ttl=60)
+    with mock.patch("app.utils.cache.time.monotonic", return_value=100):
+        cache.set("key", "value", cache.generation, tags=[])
+    with mock.patch("app.utils.cache.time.monotonic", return_value=161):
+        assert cache.get("key") is None
+
+    assert cache.metrics.expirations == 1
+    assert cache.status()["size"] == 0
+
+
+def test_cache_should_return_stale_entry_within_stale_window():
+    cache = ResponseCache(max_size=2, ttl=60, stale_ttl=30)
+    with mock.patch("app.utils.cache.time.monotonic", return_value=100):
+        cache.set("key", "value", cache.generation, tags=[])
+
+    with mock.patch("app.utils.cache.time.monotonic", return_value=150):
+        assert cache.get_hit("key") == ("value", 50, False)
+    with mock.patch("app.utils.cache.time.monotonic", return_value=170):
+        assert cache.get("key") is None
+        assert cache.get_hit("key") == ("value", 70, True)
+    with mock.patch("app.utils.cache.time.monotonic", return_value=190):
+        assert cache.get_hit("key") is None
+
+    assert cache.metrics.hits == 1
+    assert cache.metrics.stale_hits == 1
+    assert cache.metrics.expirations == 1
+
+
+def test_cache_should_not_return_invalidated_stale_entry():
+    cache = ResponseCache(max_size=2, ttl=0, stale_ttl=60)
+    cache.set("key", "value", cache.generation, tags=["x"])
+
+    cache.invalidate(["x"])
+
+    assert cache.get_hit("key") is None
+
+
+def test_cache_should_invalidate_only_tagged_entries():
+    cache = ResponseCache(max_size=10, ttl=60)
+    cache.set("a", 1, cache.generation, tags=["x"])
+    cache.set("b", 2, cache.generation, tags=["x", "y"])
+    cache.set("c", 3, cache.generation, tags=["z"])
+
+    cache.invalidate(["y"])
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.metrics.invalidations == 1
+
+
+def test_cache_should_not_store_value_read_before_invalidation():
+    cache = ResponseCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate(["x"])
+    cache.set("a", 1, generation, tags=["x"])
+
+    assert cache.get("a") is None
+
+
+def test_cache_with_zero_size_should_not_store_anything():
+    cache = ResponseCache(max_size=0, ttl=60)
+    cache.set("a", 1, cache.generation, tags=[])
+
+    assert cache.get("a") is None
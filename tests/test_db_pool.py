@@ -0,0 +1,31 @@
+from http import HTTPStatus
+
+from app.db import get_async_engine, get_engine
+from app.settings import settings
+
+
+def test_engine_should_be_shared_between_calls():
+    assert get_engine(settings.database) is get_engine(settings.database)
+
+
+def test_async_engine_should_be_shared_between_calls():
+    assert get_async_engine(settings.database) is get_async_engine(settings.database)
+
+
+def test_pool_should_respect_settings():
+    pool = get_engine(settings.database).pool
+    assert pool.size() == settings.database_pool_size
+    assert pool.timeout() == settings.database_pool_timeout
+
+
+def test_database_metrics_should_count_checkouts(admin_cli):
+    res = admin_cli.get("/api/admin/metrics/database")
+    assert res.status_code == HTTPStatus.OK, res.text
+    checkouts = res.json()["async"]["checkouts"]
+
+    for limit in range(1, 4):
+        admin_cli.get("/api/menu", params={"limit": limit})
+
+    res = admin_cli.get("/api/admin/metrics/database")
+    assert res.json()["async"]["checkouts"] >= checkouts + 3
+    assert res.json()["async"]["checked_out"] == 0
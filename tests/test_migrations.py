@@ -0,0 +1,122 @@
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import SecretStr
+from sqlalchemy import create_engine, inspect, make_url, text
+
+from alembic import command
+from alembic.config import Config
+from app.api.utils import create_access_token
+from app.db import Base
+from app.main import app
+from app.settings import settings
+
+ALEMBIC_DIRECTORY = Path(__file__).parents[1] / "alembic"
+
+
+@pytest.fixture
+def migrations_database(engine):
+    with engine.connect() as conn:
+        if not conn.scalar(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        ):
+            pytest.skip("pg_trgm extension is not available")
+
+    url = make_url(settings.database.get_secret_value())
+    url = url.set(database=f"{url.database}_migrations")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)'))
+        conn.execute(text(f'CREATE DATABASE "{url.database}"'))
+
+    dsn = url.render_as_string(hide_password=False)
+    migrations_engine = create_engine(dsn)
+    yield dsn, migrations_engine
+
+    migrations_engine.dispose()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f'DROP DATABASE "{url.database}" WITH (FORCE)'))
+
+
+def migrate(dsn, revision):
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIRECTORY))
+    config.set_main_option("sqlalchemy.url", dsn)
+    command.upgrade(config, revision)
+
+
+def insert_position(conn, name):
+    conn.execute(
+        text(
+            "INSERT INTO menu_position "
+            "(name, price, preparation_time, is_vegan, created_at, updated_at) "
+            "VALUES (:name, 10.0, 15, false, now(), now())"
+        ),
+        {"name": name},
+    )
+
+
+def test_migrations_should_create_unique_constraints_declared_on_models(
+    migrations_database,
+):
+    dsn, migrations_engine = migrations_database
+    migrate(dsn, "head")
+
+    inspector = inspect(migrations_engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        migrated = {
+            constraint["name"]
+            for constraint in inspector.get_unique_constraints(table.name)
+        }
+        declared = {
+            constraint.name
+            for constraint in table.constraints
+            if constraint.__visit_name__ == "unique_constraint"
+        }
+        assert declared <= migrated, table.name
+
+
+def test_menu_position_name_migration_should_rename_duplicated_names(
+    migrations_database,
+):
+    dsn, migrations_engine = migrations_database
+    migrate(dsn, "0010")
+    with migrations_engine.begin() as conn:
+        for name in ["pizza", "pizza", "soup", "pizza"]:
+            insert_position(conn, name)
+
+    migrate(dsn, "0011")
+
+    with migrations_engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, name FROM menu_position ORDER BY id"))
+        assert [name for _, name in rows] == ["pizza", "pizza (2)", "soup", "pizza (4)"]
+
+
+def test_bulk_create_positions_should_work_on_migrated_schema(
+    migrations_database, monkeypatch
+):
+    dsn, migrations_engine = migrations_database
+    migrate(dsn, "head")
+    with migrations_engine.begin() as conn:
+        insert_position(conn, "existing")
+    monkeypatch.setattr(settings, "database", SecretStr(dsn))
+    positions = [
+        {"name": name, "price": 10.0, "preparation_time": 15}
+        for name in ["existing", "first", "first"]
+    ]
+
+    token = create_access_token(data={"sub": "test"})
+    with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as client:
+        res = client.post(
+            "/api/admin/menu_position/bulk", json={"positions": positions}
+        )
+
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert [position["name"] for position in res.json()["created"]] == ["first"]
+    assert res.json()["conflicts"] == [
+        {"index": 0, "name": "existing"},
+        {"index": 2, "name": "first"},
+    ]
@@ -0,0 +1,124 @@
+import json
+import select
+import time
+from http import HTTPStatus
+
+import psycopg2
+from sqlalchemy import text
+
+from app.settings import settings
+from app.utils.cache import menu_cache, menu_tag
+from app.utils.changes import CHANGES_CHANNEL, ORIGIN
+from app.utils.notifications import handle_notification
+
+LISTENER_PIDS = text(
+    "SELECT pid FROM pg_stat_activity WHERE query = :query AND pid <> pg_backend_pid()"
+).bindparams(query=f'LISTEN "{CHANGES_CHANNEL}"')
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.05)
+
+
+def get_listener_pids(engine):
+    with engine.connect() as connection:
+        return set(connection.execute(LISTENER_PIDS).scalars().all())
+
+
+def given_listener_is_running(engine):
+    wait_for(lambda: get_listener_pids(engine))
+    return get_listener_pids(engine)
+
+
+def given_cached_menu(test_client, menu_id):
+    res = test_client.get(f"/api/menu/{menu_id}")
+    assert res.status_code == HTTPStatus.OK, res.text
+    assert menu_cache.get(menu_tag(menu_id)) is not None
+
+
+def test_admin_write_should_notify_about_changed_menus(admin_cli, with_menu):
+    connection = psycopg2.connect(settings.database.get_secret_value())
+    connection.autocommit = True
+    connection.cursor().execute(f"LISTEN {CHANGES_CHANNEL}")
+
+    res = admin_cli.patch(f"/api/admin/menu/{with_menu.id}", json={"name": "new"})
+    assert res.status_code == HTTPStatus.OK, res.text
+
+    select.select([connection], [], [], 5)
+    connection.poll()
+    payloads = [json.loads(notify.payload) for notify in connection.notifies]
+    connection.close()
+
+    assert payloads == [
+        {
+            "origin": ORIGIN,
+            "menus": [with_menu.id],
+            "positions": [],
+            "events": [["updated", [with_menu.id], []]],
+        }
+    ]
+
+
+def test_failed_admin_write_should_not_notify(admin_cli, with_menu):
+    connection = psycopg2.connect(settings.database.get_secret_value())
+    connection.autocommit = True
+    connection.cursor().execute(f"LISTEN {CHANGES_CHANNEL}")
+
+    res = admin_cli.post("/api/admin/menu", json={"name": with_menu.name})
+    assert res.status_code == HTTPStatus.BAD_REQUEST, res.text
+
+    select.select([connection], [], [], 0.5)
+    connection.poll()
+    assert connection.notifies == []
+    connection.close()
+
+
+def test_notification_from_other_worker_should_invalidate_cache(
+    admin_cli, db_api, engine, with_menu
+):
+    given_listener_is_running(engine)
+    given_cached_menu(admin_cli, with_menu.id)
+
+    payload = json.dumps({"origin": "other", "menus": [with_menu.id], "positions": []})
+    db_api.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHANGES_CHANNEL, "payload": payload},
+    )
+    db_api.commit()
+
+    wait_for(lambda: menu_cache.get(menu_tag(with_menu.id)) is None)
+
+
+def test_own_notification_should_be_skipped(admin_cli, with_menu):
+    given_cached_menu(admin_cli, with_menu.id)
+
+    payload = json.dumps({"origin": ORIGIN, "menus": [with_menu.id], "positions": []})
+    handle_notification(None, 0, CHANGES_CHANNEL, payload)
+
+    assert menu_cache.get(menu_tag(with_menu.id)) is not None
+
+
+def test_invalid_notification_should_flush_cache(admin_cli, with_menu):
+    given_cached_menu(admin_cli, with_menu.id)
+
+    handle_notification(None, 0, CHANGES_CHANNEL, "not json")
+
+    assert menu_cache.get(menu_tag(with_menu.id)) is None
+
+
+def test_listener_should_reconnect_and_flush_cache_after_connection_loss(
+    admin_cli, engine, with_menu
+):
+    pids = given_listener_is_running(engine)
+    given_cached_menu(admin_cli, with_menu.id)
+
+    with engine.connect() as connection:
+        for pid in pids:
+            connection.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+
+    wait_for(lambda: get_listener_pids(engine) - pids)
+
+    wait_for(lambda: menu_cache.get(menu_tag(with_menu.id)) is None)
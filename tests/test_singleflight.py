@@ -0,0 +1,154 @@
+import asyncio
+
+from app.utils.singleflight import SingleFlight
+
+
+class Loader:
+    def __init__(self, result="value", delay=0.05, error=None):
+        self.calls = 0
+        self.result = result
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_single_flight_should_load_once_for_concurrent_callers():
+    flights = SingleFlight(timeout=1)
+    load = Loader()
+
+    async def scenario():
+        return await asyncio.gather(*[flights.run("key", load) for _ in range(10)])
+
+    assert asyncio.run(scenario()) == ["value"] * 10
+    assert load.calls == 1
+    assert flights.status() == {
+        "in_flight": 0,
+        "loads": 1,
+        "coalesced": 9,
+        "refreshes": 0,
+        "timeouts": 0,
+    }
+
+
+def test_single_flight_should_load_different_keys_separately():
+    flights = SingleFlight(timeout=1)
+    load = Loader()
+
+    async def scenario():
+        return await asyncio.gather(flights.run("a", load), flights.run("b", load))
+
+    asyncio.run(scenario())
+    assert load.calls == 2
+
+
+def test_single_flight_should_share_error_and_retry_next_time():
+    flights = SingleFlight(timeout=1)
+    load = Loader(error=ValueError("broken"))
+
+    async def scenario():
+        results = await asyncio.gather(
+            flights.run("key", load), flights.run("key", load), return_exceptions=True
+        )
+        load.error = None
+        return results, await flights.run("key", load)
+
+    errors, result = asyncio.run(scenario())
+    assert [str(error) for error in errors] == ["broken", "broken"]
+    assert result == "value"
+    assert load.calls == 2
+
+
+def test_single_flight_should_time_out_slow_load():
+    flights = SingleFlight(timeout=0.05)
+    load = Loader(delay=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            flights.run("key", load), flights.run("key", load), return_exceptions=True
+        )
+
+    errors = asyncio.run(scenario())
+    assert all(isinstance(error, asyncio.TimeoutError) for error in errors)
+    assert flights.status()["timeouts"] == 1
+    assert flights.status()["in_flight"] == 0
+
+
+def test_single_flight_should_finish_load_when_first_caller_is_cancelled():
+    flights = SingleFlight(timeout=1)
+    load = Loader()
+
+    async def scenario():
+        leader = asyncio.ensure_future(flights.run("key", load))
+        follower = asyncio.ensure_future(flights.run("key", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == "value"
+    assert load.calls == 1
+
+
+def test_single_flight_should_not_join_forgotten_load():
+    flights = SingleFlight(timeout=1)
+    load = Loader()
+
+    async def scenario():
+        first = asyncio.ensure_future(flights.run("key", load))
+        await asyncio.sleep(0)
+        flights.forget()
+        return await asyncio.gather(first, flights.run("key", load))
+
+    assert asyncio.run(scenario()) == ["value", "value"]
+    assert load.calls == 2
+
+
+def test_single_flight_should_refresh_in_background_once_per_key():
+    flights = SingleFlight(timeout=1)
+    load = Loader()
+
+    async def scenario():
+        for _ in range(5):
+            flights.refresh("key", load)
+        in_flight = flights.status()["in_flight"]
+        await asyncio.sleep(0.1)
+        return in_flight
+
+    assert asyncio.run(scenario()) == 1
+    assert load.calls == 1
+    assert flights.status()["refreshes"] == 1
+
+
+def test_single_flight_should_not_refresh_key_loaded_by_caller():
+    flights = SingleFlight(timeout=1)
+    load = Loader()
+
+    async def scenario():
+        loading = asyncio.ensure_future(flights.run("key", load))
+        await asyncio.sleep(0)
+        flights.refresh("key", load)
+        return await loading
+
+    assert asyncio.run(scenario()) == "value"
+    assert load.calls == 1
+    assert flights.status()["refreshes"] == 0
+
+
+def test_single_flight_should_cancel_pending_refreshes():
+    flights = SingleFlight(timeout=1)
+
+    async def load():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        flights.refresh("key", load)
+        await asyncio.sleep(0)
+        await flights.cancel_pending()
+
+    asyncio.run(scenario())
+    assert flights.status()["in_flight"] == 0